@@ -1,3 +1,4 @@
+import logging
 from flask import Flask
 from flask_sqlalchemy import SQLAlchemy
 from flask_bcrypt import Bcrypt
@@ -11,14 +12,22 @@ def create_app(config_path='config.cfg'):
     app = Flask(__name__)
     app.config.from_pyfile(config_path)
 
+    # Modules log under the app logger ('application.*'). The full scheduling trace is at
+    # DEBUG, shown in debug mode; otherwise only warnings, unless LOG_LEVEL says otherwise
+    app.logger.setLevel(app.config.get('LOG_LEVEL') or (logging.DEBUG if app.debug else logging.WARNING))
+
     db.init_app(app)
     bcrypt.init_app(app)
     login_manager.init_app(app)
     login_manager.login_view = '/'
 
     with app.app_context():
-        from .models import User, Branch, Level, Coach, Enrollment, PopularTimeslot, CoachBranch, CoachOffday, CoachPreference, Timetable, TimetableEntry
+        from .models import User, Branch, Level, Coach, Enrollment, PopularTimeslot, CoachBranch, CoachOffday, CoachPreference, Timetable, TimetableEntry, TimetableSummary, DataVersion
         db.create_all()
+
+        # create_all() skips tables that already exist, so add indexes declared since
+        for index in Timetable.__table__.indexes:
+            index.create(db.engine, checkfirst=True)
         db.session.commit()
 
     # from application.forms import LoginForm, RegisterForm
@@ -0,0 +1,165 @@
+import numpy as np
+
+from application.time_utils import minutes_to_time
+
+# One row per feasible (requirement, coach, timeslot); categorical fields hold codes
+ASSIGNMENT_DTYPE = np.dtype([
+    ('coach', np.int32),
+    ('branch', np.int16),
+    ('level', np.int16),
+    ('day', np.int8),
+    ('period', np.int8),
+    ('start_minutes', np.int16),
+    ('end_minutes', np.int16),
+    ('start_slot', np.int16),
+    ('end_slot', np.int16),
+    ('duration', np.int16),
+    ('capacity', np.int16),
+    ('students_available', np.int32),
+    ('is_popular', np.bool_)
+])
+
+_NUMERIC_FIELDS = ['start_minutes', 'end_minutes', 'start_slot', 'end_slot', 'duration', 'capacity', 'students_available', 'is_popular']
+
+class FeasibleAssignmentStore:
+    """
+    Columnar store of feasible assignments
+
+    Rows live in a NumPy structured array with coach, branch, level, day and period
+    interned as codes into the category lists. A row's assignment id is its position.
+    Rows are read through AssignmentRow views built by select().
+    """
+
+    def __init__(self, rows, coach_ids, coach_names, coach_statuses, branches, levels, days, periods):
+        self.rows = rows
+        self.coach_ids = coach_ids
+        self.coach_names = coach_names
+        self.coach_statuses = coach_statuses
+        self.branches = branches
+        self.levels = levels
+        self.days = days
+        self.periods = periods
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __iter__(self):
+        return iter(self.select())
+
+    def popular_indices(self):
+        """Row positions of assignments in popular timeslots"""
+        return np.flatnonzero(self.rows['is_popular'])
+
+    def popular_count(self):
+        return int(np.count_nonzero(self.rows['is_popular']))
+
+    def capacity_by_requirement(self, popular_only=True):
+        """Total class capacity per (branch, level), optionally over popular rows only"""
+        rows = self.rows[self.rows['is_popular']] if popular_only else self.rows
+
+        keys = rows['branch'].astype(np.int64) * len(self.levels) + rows['level']
+        totals = np.bincount(keys, weights=rows['capacity'], minlength=len(self.branches) * len(self.levels))
+
+        return {(self.branches[key // len(self.levels)], self.levels[key % len(self.levels)]): int(total)
+                for key, total in enumerate(totals) if total > 0}
+
+    def select(self, indices=None):
+        """Decode the given rows (all rows by default) and return a view per row, in order"""
+        if indices is None:
+            indices = np.arange(len(self.rows))
+        rows = self.rows[indices]
+
+        coach_codes = rows['coach'].tolist()
+        start_minutes = rows['start_minutes'].tolist()
+        end_minutes = rows['end_minutes'].tolist()
+
+        # Time labels repeat heavily, so decode each distinct value once
+        time_labels = {minutes: minutes_to_time(minutes) for minutes in set(start_minutes) | set(end_minutes)}
+
+        columns = {
+            'id': np.asarray(indices).tolist(),
+            'coach_id': [self.coach_ids[code] for code in coach_codes],
+            'coach_name': [self.coach_names[code] for code in coach_codes],
+            'coach_status': [self.coach_statuses[code] for code in coach_codes],
+            'branch': [self.branches[code] for code in rows['branch'].tolist()],
+            'level': [self.levels[code] for code in rows['level'].tolist()],
+            'day': [self.days[code] for code in rows['day'].tolist()],
+            'period': [self.periods[code] for code in rows['period'].tolist()],
+            'start_time': [time_labels[minutes] for minutes in start_minutes],
+            'end_time': [time_labels[minutes] for minutes in end_minutes]
+        }
+        for field in _NUMERIC_FIELDS:
+            columns[field] = rows[field].tolist()
+
+        return [AssignmentRow(columns, position) for position in range(len(rows))]
+
+
+class AssignmentRow:
+    """
+    Dict-style view of one decoded assignment row
+
+    Values written through the view are kept on the view itself and never reach the store.
+    """
+    __slots__ = ('_columns', '_position', '_overrides')
+
+    def __init__(self, columns, position):
+        self._columns = columns
+        self._position = position
+        self._overrides = None
+
+    def __getitem__(self, key):
+        if self._overrides is not None and key in self._overrides:
+            return self._overrides[key]
+        return self._columns[key][self._position]
+
+    def __setitem__(self, key, value):
+        if self._overrides is None:
+            self._overrides = {}
+        self._overrides[key] = value
+
+    def __contains__(self, key):
+        return key in self._columns or (self._overrides is not None and key in self._overrides)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def keys(self):
+        return list(self._columns) + [key for key in (self._overrides or {}) if key not in self._columns]
+
+    def to_dict(self):
+        return {key: self[key] for key in self.keys()}
+
+    def __repr__(self):
+        return f"AssignmentRow({self.to_dict()!r})"
+
+
+class CandidateBatch:
+    """
+    Row views of one candidate list together with their store fields as parallel arrays
+
+    Position i of every array describes views[i], so a position picked with array
+    operations maps straight back to its assignment. Codes index the store's category
+    lists, as in the rows themselves; users may attach further per-candidate arrays.
+    """
+
+    def __init__(self, store, views):
+        self.views = views
+        self.ids = np.fromiter((view['id'] for view in views), dtype=np.intp, count=len(views))
+
+        rows = store.rows[self.ids]
+        self.coach = rows['coach'].astype(np.intp)
+        self.day = rows['day'].astype(np.intp)
+        self.period = rows['period'].astype(np.intp)
+        self.start_minutes = rows['start_minutes'].astype(np.int32)
+        self.end_minutes = rows['end_minutes'].astype(np.int32)
+        self.duration = rows['duration'].astype(np.int32)
+
+        start_slot = rows['start_slot'].astype(np.int64)
+        end_slot = rows['end_slot'].astype(np.int64)
+        self.slot_mask = ((np.int64(1) << (end_slot - start_slot)) - 1) << start_slot
+
+    def __len__(self):
+        return len(self.views)
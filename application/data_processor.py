@@ -1,10 +1,20 @@
+import hashlib
+import json
+import logging
+import re
+import threading
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from bisect import bisect_right
 from collections import defaultdict
 from typing import Dict, List, Tuple, Set, Optional
+from sqlalchemy.orm import selectinload
 from application import db
-from application.models import DayOfWeek, User, Coach, Level, Branch, CoachBranch, CoachOffday, CoachPreference, Enrollment, PopularTimeslot
+from application.assignment_store import ASSIGNMENT_DTYPE, FeasibleAssignmentStore
+from application.time_utils import SLOT_MINUTES, time_to_minutes, minutes_to_time, slot_span
+from application.models import DayOfWeek, Coach, Level, Branch, CoachBranch, CoachOffday, Enrollment, PopularTimeslot, DataVersion
+
+logger = logging.getLogger(__name__)
 
 class DataDrivenProcessor:
     """
@@ -12,15 +22,11 @@ class DataDrivenProcessor:
     """
     
     def __init__(self):
-        print(f"Current Date and Time (UTC - YYYY-MM-DD HH:MM:SS formatted): {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        current_user = User.query.first()
-        print(f"Current User's Login: {current_user.username if current_user else 'unknown'}")
-        print("DATA-DRIVEN PROCESSOR - DB DRIVEN")
-        print("=" * 70)
+        logger.debug("DATA-DRIVEN PROCESSOR - DB DRIVEN")
         
     def load_and_process_data(self):
         """Main data loading - everything from database"""
-        print("Loading ALL data from database...")
+        logger.debug("Loading ALL data from database...")
         
         # Load ALL database models
         self._load_all_from_db()
@@ -32,45 +38,64 @@ class DataDrivenProcessor:
         self.coaches_data = self._process_coaches_from_data()
         self.requirements_data = self._process_requirements_from_data()
         self.popular_timeslots_set = self._process_popular_timeslots_from_data()
+        self.popular_intervals = self._build_popular_interval_index()
         self.timeslots_data = self._generate_timeslots_from_operating_hours()
         self.feasible_assignments = self._generate_feasible_assignments_from_data()
         
-        print(f"✓ Processed {len(self.coaches_data)} coaches from data")
-        print(f"✓ Processed {len(self.requirements_data)} requirements from data")
-        print(f"✓ Loaded {len(self.popular_timeslots_set)} popular timeslot definitions from data")
-        print(f"✓ Generated {len(self.timeslots_data)} valid timeslots from operating hours")
-        print(f"✓ Created {len(self.feasible_assignments)} feasible assignments")
+        logger.debug("✓ Processed %s coaches from data", len(self.coaches_data))
+        logger.debug("✓ Processed %s requirements from data", len(self.requirements_data))
+        logger.debug("✓ Loaded %s popular timeslot definitions from data", len(self.popular_timeslots_set))
+        logger.debug("✓ Generated %s valid timeslots from operating hours", len(self.timeslots_data))
+        logger.info("Created %s feasible assignments", len(self.feasible_assignments))
         
-        return self._package_comprehensive_data()
+        package = self._package_comprehensive_data()
+        package['fingerprint'] = data_fingerprint(package)
+        return package
     
     def _load_all_from_db(self):
         """Load all available data from database models"""
+        # Branch and level associations are fetched in one batched query each, not per coach
+        self._load_from_records(
+            enrollments=Enrollment.query.all(),
+            levels=Level.query.order_by(Level.id).all(),
+            branches=Branch.query.all(),
+            coaches=Coach.query.options(
+                selectinload(Coach.assigned_branches),
+                selectinload(Coach.preferred_levels)
+            ).all(),
+            offdays=CoachOffday.query.all(),
+            popular_slots=PopularTimeslot.query.all()
+        )
+    
+    def _load_from_records(self, enrollments, levels, branches, coaches, offdays, popular_slots):
+        """Build the input frames from model instances, which need not come from a session"""
         
         # Enrollment data
-        enrollments = Enrollment.query.all()
         self.enrollment_df = pd.DataFrame([{
             'Branch': enrollment.branch,
             'Level Category Base': enrollment.level_category_base,
             'Count': enrollment.count
         } for enrollment in enrollments])
-        print(f"  ✓ Loaded enrollments from DB: {len(self.enrollment_df)} records")
+        logger.debug("  ✓ Loaded enrollments from DB: %s records", len(self.enrollment_df))
+        
+        # Levels and branches are small lookup tables, resolve ids against them in memory
+        self.levels = levels
+        self.branches = branches
+        level_names = {level.id: level.name for level in self.levels}
+        branch_abbrvs = {branch.id: branch.abbrv for branch in self.branches}
         
         # Coaches data - now with qualification columns directly
-        coaches = Coach.query.all()
         coach_records = []
-
-        levels = db.session.query(Level.name).order_by(Level.id).all()
         
         for coach in coaches:
             # Get branch assignments as a string
-            assigned_branches = [cb.branch.abbrv for cb in coach.assigned_branches]
+            assigned_branches = [branch_abbrvs[cb.branch_id] for cb in coach.assigned_branches]
             assigned_branch_str = ",".join(assigned_branches)
 
-            preference = {level: False for (level,) in levels}
+            preference = {level.name: False for level in self.levels}
 
-            level_preference = db.session.query(CoachPreference).filter(CoachPreference.coach_id == coach.id).all()
-            for cl in level_preference:
-                preference[cl.level.name] = True
+            for cl in coach.preferred_levels:
+                preference[level_names[cl.level_id]] = True
             
             # Create record with all qualification columns directly from the model
             record = {
@@ -85,11 +110,9 @@ class DataDrivenProcessor:
             coach_records.append(record | preference)
         
         self.coaches_df = pd.DataFrame(coach_records)
-        print(f"  ✓ Loaded coaches from DB: {len(self.coaches_df)} records")
+        logger.debug("  ✓ Loaded coaches from DB: %s records", len(self.coaches_df))
         
         # Availability data
-        offdays = CoachOffday.query.all()
-
         offday_dict = {}
         for offday in offdays:
             day = DayOfWeek(offday.day).name
@@ -112,41 +135,39 @@ class DataDrivenProcessor:
         
         self.availability_df = pd.DataFrame(availability_data)
 
-        print(f"  ✓ Loaded availability from DB: {len(self.availability_df)} records")
+        logger.debug("  ✓ Loaded availability from DB: %s records", len(self.availability_df))
         
         # Popular timeslots data
-        popular_slots = PopularTimeslot.query.all()
         self.popular_df = pd.DataFrame([{
             'time_slot': slot.time_slot,
             'day': slot.day,
             'level': slot.level
         } for slot in popular_slots])
-        print(f"  ✓ Loaded popular timeslots from DB: {len(self.popular_df)} records")
+        logger.debug("  ✓ Loaded popular timeslots from DB: %s records", len(self.popular_df))
         
         # Branch config data
-        branches = Branch.query.all()
-        if branches:
+        if self.branches:
             self.branch_config_df = pd.DataFrame([{
                 'branch': branch.abbrv,
                 'max_classes_per_slot': branch.max_classes
-            } for branch in branches])
-            print(f"  ✓ Loaded branch configs from DB: {len(self.branch_config_df)} records")
+            } for branch in self.branches])
+            logger.debug("  ✓ Loaded branch configs from DB: %s records", len(self.branch_config_df))
         else:
             # Create from description if no data
             self.branch_config_df = pd.DataFrame({
                 'branch': ['BB', 'CCK', 'CH', 'HG', 'KT', 'PR'],
                 'max_classes_per_slot': [4, 4, 5, 4, 4, 6]
             })
-            print(f"  ℹ Created branch_config from business rules: {len(self.branch_config_df)} records")
+            logger.warning("No branch data in DB, created branch_config from business rules: %s records", len(self.branch_config_df))
     
     def _extract_business_rules_from_data(self):
         """Extract ALL business rules from the actual data"""
-        print("  Extracting business rules from database data...")
+        logger.debug("  Extracting business rules from database data...")
         
         # Extract levels from enrollment data or Level model
         self.all_levels = sorted(self.enrollment_df['Level Category Base'].unique()) if not self.enrollment_df.empty else []
         if not self.all_levels:
-            self.all_levels = sorted([level.name for level in Level.query.all()])
+            self.all_levels = sorted([level.name for level in self.levels])
             
         # Map DB level names to expected format
         level_mapping = {
@@ -158,13 +179,13 @@ class DataDrivenProcessor:
         }
         
         self.all_levels = [level_mapping.get(level, level) for level in self.all_levels]
-        print(f"    Levels found in data: {self.all_levels}")
+        logger.debug("    Levels found in data: %s", self.all_levels)
         
         # Extract branches from enrollment data or Branch model
         self.all_branches = sorted(self.enrollment_df['Branch'].unique()) if not self.enrollment_df.empty else []
         if not self.all_branches:
-            self.all_branches = sorted([branch.abbrv for branch in Branch.query.all()])
-        print(f"    Branches found in data: {self.all_branches}")
+            self.all_branches = sorted([branch.abbrv for branch in self.branches])
+        logger.debug("    Branches found in data: %s", self.all_branches)
         
         # Extract days from availability data or use standard days
         available_days = sorted(self.availability_df['day'].unique()) if not self.availability_df.empty else []
@@ -173,12 +194,12 @@ class DataDrivenProcessor:
         
         # Filter to operating days (exclude MON based on business rule)
         self.all_days = [day for day in available_days if day != 'MON']
-        print(f"    Operating days found in data: {self.all_days}")
+        logger.debug("    Operating days found in data: %s", self.all_days)
         
         # Categorize days
         self.weekdays = [day for day in self.all_days if day in ['TUE', 'WED', 'THU', 'FRI']]
         self.weekends = [day for day in self.all_days if day in ['SAT', 'SUN']]
-        print(f"    Weekdays: {self.weekdays}, Weekends: {self.weekends}")
+        logger.debug("    Weekdays: %s, Weekends: %s", self.weekdays, self.weekends)
         
         # Extract coach statuses from coaches data
         coach_statuses = set()
@@ -188,12 +209,12 @@ class DataDrivenProcessor:
             if 'position' in self.coaches_df.columns:
                 coach_statuses.update(self.coaches_df['position'].dropna().unique())
         
-        self.coach_statuses = list(coach_statuses) if coach_statuses else ['Full Time', 'Part Time', 'Branch Manager']
-        print(f"    Coach statuses found: {self.coach_statuses}")
+        self.coach_statuses = sorted(coach_statuses) if coach_statuses else ['Full Time', 'Part Time', 'Branch Manager']
+        logger.debug("    Coach statuses found: %s", self.coach_statuses)
         
         # Extract level qualification columns
-        self.qualification_columns = db.session.query(Level.name).order_by(Level.id).all()
-        print(f"    Qualification columns defined: {self.qualification_columns}")
+        self.qualification_columns = [(level.name,) for level in self.levels]
+        logger.debug("    Qualification columns defined: %s", self.qualification_columns)
         
         # Set business constants from description and data
         self._derive_business_constants()
@@ -203,8 +224,7 @@ class DataDrivenProcessor:
         
         # Class capacities from database or business rules
         self.class_capacities = {}
-        levels = Level.query.all()
-        for level_obj in levels:
+        for level_obj in self.levels:
             level_name = level_obj.name
             # Map level names from DB to expected format if needed
             if level_name == "BearyTots":
@@ -232,7 +252,7 @@ class DataDrivenProcessor:
         
         # Class durations from database or business rules
         self.class_durations = {}
-        for level_obj in levels:
+        for level_obj in self.levels:
             level_name = level_obj.name
             # Map level names from DB to expected format if needed
             if level_name == "BearyTots":
@@ -291,10 +311,10 @@ class DataDrivenProcessor:
         # Level hierarchy from business rules
         self.level_hierarchy = ['Tots', 'Jolly', 'Bubbly', 'Lively', 'Flexi', 'L1', 'L2', 'L3', 'L4', 'Advance', 'Free']
         
-        print(f"    Class capacities derived: {self.class_capacities}")
-        print(f"    Class durations derived: {self.class_durations}")
-        print(f"    Branch limits from DB: {self.branch_limits}")
-        print(f"    Operating hours defined: {list(self.operating_hours.keys())}")
+        logger.debug("    Class capacities derived: %s", self.class_capacities)
+        logger.debug("    Class durations derived: %s", self.class_durations)
+        logger.debug("    Branch limits from DB: %s", self.branch_limits)
+        logger.debug("    Operating hours defined: %s", list(self.operating_hours.keys()))
     
     def _process_coaches_from_data(self):
         """Process coaches completely from database data"""
@@ -412,7 +432,7 @@ class DataDrivenProcessor:
         """Process popular timeslots directly from database"""
         popular_slots = set()
         
-        print("  Processing popular timeslots from data:")
+        logger.debug("  Processing popular timeslots from data:")
         for _, row in self.popular_df.iterrows():
             level = str(row['level'])
             day = str(row['day']).upper()
@@ -421,21 +441,60 @@ class DataDrivenProcessor:
             if level in self.all_levels and day in self.all_days:
                 popular_slots.add((level, day, time_slot))
         
-        print(f"    Processed {len(popular_slots)} popular timeslot combinations")
+        logger.debug("    Processed %s popular timeslot combinations", len(popular_slots))
         
         # Show distribution by level
         by_level = defaultdict(int)
         for level, day, time_slot in popular_slots:
             by_level[level] += 1
         
-        print("    Popular slots by level:")
+        logger.debug("    Popular slots by level:")
         for level in self.level_hierarchy:
             if level in self.all_levels:
                 count = by_level[level]
-                print(f"      {level}: {count} popular slots")
+                logger.debug("      %s: %s popular slots", level, count)
         
         return popular_slots
     
+    def _build_popular_interval_index(self):
+        """Index popular time ranges per (level, day) as sorted starts with a running max of ends"""
+        ranges = defaultdict(list)
+        for level, day, time_slot in self.popular_timeslots_set:
+            if '-' not in time_slot:
+                continue
+            parts = time_slot.split('-')
+            start_minutes = self._parse_clock_minutes(parts[0])
+            end_minutes = self._parse_clock_minutes(parts[1])
+            if start_minutes is None or end_minutes is None:
+                # Skip invalid time format
+                continue
+            ranges[(level, day)].append((start_minutes, end_minutes))
+        
+        intervals = {}
+        for key, spans in ranges.items():
+            spans.sort()
+            starts = []
+            max_ends = []
+            max_end = -1
+            for start_minutes, end_minutes in spans:
+                max_end = max(max_end, end_minutes)
+                starts.append(start_minutes)
+                max_ends.append(max_end)
+            intervals[key] = (starts, max_ends)
+        
+        return intervals
+    
+    @staticmethod
+    def _parse_clock_minutes(value):
+        """Minutes after midnight for a valid 'H:MM' / 'HH:MM' string, else None"""
+        match = re.fullmatch(r'(\d{1,2}):(\d{1,2})', value)
+        if not match:
+            return None
+        hours, minutes = int(match.group(1)), int(match.group(2))
+        if hours > 23 or minutes > 59:
+            return None
+        return hours * 60 + minutes
+    
     def _generate_timeslots_from_operating_hours(self):
         """Generate all valid timeslots from operating hours"""
         timeslots = []
@@ -448,140 +507,148 @@ class DataDrivenProcessor:
                     continue
                 
                 for period_start, period_end in self.operating_hours[day]:
-                    start_dt = datetime.strptime(period_start, '%H:%M')
-                    end_dt = datetime.strptime(period_end, '%H:%M')
+                    start_minutes = time_to_minutes(period_start)
+                    end_minutes = time_to_minutes(period_end)
                     
                     # Generate 30-minute intervals
-                    current = start_dt
-                    while current + timedelta(minutes=duration) <= end_dt:
-                        slot_start = current.strftime('%H:%M')
-                        slot_end = (current + timedelta(minutes=duration)).strftime('%H:%M')
+                    current = start_minutes
+                    while current + duration <= end_minutes:
+                        class_end = current + duration
+                        slot_start = minutes_to_time(current)
+                        slot_end = minutes_to_time(class_end)
                         
                         # Check lunch break on weekdays (12:00-14:00)
                         valid_slot = True
                         if day in self.weekdays:
-                            class_start = current
-                            class_end = current + timedelta(minutes=duration)
-                            lunch_start = datetime.strptime('12:00', '%H:%M')
-                            lunch_end = datetime.strptime('14:00', '%H:%M')
+                            lunch_start = time_to_minutes('12:00')
+                            lunch_end = time_to_minutes('14:00')
                             
                             # Skip if overlaps with lunch
-                            if not (class_end <= lunch_start or class_start >= lunch_end):
+                            if not (class_end <= lunch_start or current >= lunch_end):
                                 valid_slot = False
                         
                         if valid_slot:
-                            period = 'am' if current.hour < 12 else 'pm'
+                            period = 'am' if current < time_to_minutes('12:00') else 'pm'
                             time_slot_str = f"{slot_start}-{slot_end}"
+                            start_slot, end_slot = slot_span(current, class_end)
                             
                             # Check if this timeslot is popular
-                            is_popular = self._is_popular_timeslot(level, day, time_slot_str)
+                            is_popular = self._is_popular_timeslot(level, day, time_slot_str, current, class_end)
                             
                             timeslots.append({
                                 'level': level,
                                 'day': day,
                                 'start_time': slot_start,
                                 'end_time': slot_end,
+                                'start_minutes': current,
+                                'end_minutes': class_end,
+                                'start_slot': start_slot,
+                                'end_slot': end_slot,
                                 'duration': duration,
                                 'period': period,
                                 'is_popular': is_popular,
                                 'time_slot_str': time_slot_str
                             })
                         
-                        current += timedelta(minutes=30)
+                        current += SLOT_MINUTES
         
         # Statistics
         total_slots = len(timeslots)
         popular_slots = len([ts for ts in timeslots if ts['is_popular']])
-        print(f"  Generated {total_slots} total timeslots from operating hours")
+        logger.debug("  Generated %s total timeslots from operating hours", total_slots)
         if total_slots > 0:
-            print(f"  Popular timeslots: {popular_slots} ({popular_slots/total_slots*100:.1f}%)")
+            logger.debug("  Popular timeslots: %s (%.1f%%)", popular_slots, popular_slots/total_slots*100)
         else:
-            print("  No timeslots generated - check operating hours and level data")
+            logger.warning("No timeslots generated - check operating hours and level data")
         
         return timeslots
     
-    def _is_popular_timeslot(self, level, day, time_slot_str):
+    def _is_popular_timeslot(self, level, day, time_slot_str, start_minutes, end_minutes):
         """Check if a timeslot is popular based on data"""
         # Direct match
         if (level, day, time_slot_str) in self.popular_timeslots_set:
             return True
         
-        # Check if falls within any popular time range
-        try:
-            current_start = datetime.strptime(time_slot_str.split('-')[0], '%H:%M')
-            current_end = datetime.strptime(time_slot_str.split('-')[1], '%H:%M')
-            
-            for pop_level, pop_day, pop_time_slot in self.popular_timeslots_set:
-                if pop_level == level and pop_day == day and '-' in pop_time_slot:
-                    try:
-                        pop_start = datetime.strptime(pop_time_slot.split('-')[0], '%H:%M')
-                        pop_end = datetime.strptime(pop_time_slot.split('-')[1], '%H:%M')
-                        
-                        # Check if current slot falls within popular range
-                        if pop_start <= current_start and current_end <= pop_end:
-                            return True
-                    except ValueError:
-                        # Skip invalid time format
-                        continue
-        except ValueError:
-            # Skip if current time slot has invalid format
-            pass
-        
-        return False
+        # Check if falls within any popular time range: of the ranges starting no later
+        # than this slot, the one ending latest decides containment
+        if (level, day) not in self.popular_intervals:
+            return False
+        starts, max_ends = self.popular_intervals[(level, day)]
+        position = bisect_right(starts, start_minutes)
+        return position > 0 and max_ends[position - 1] >= end_minutes
     
     def _generate_feasible_assignments_from_data(self):
-        """Generate feasible assignments based on all data constraints"""
-        assignments = []
-        assignment_id = 0
-        
+        """Generate feasible assignments based on all data constraints, as a columnar store"""
+        coach_ids = list(self.coaches_data.keys())
+        coach_codes = {coach_id: code for code, coach_id in enumerate(coach_ids)}
+        branch_codes = {branch: code for code, branch in enumerate(self.all_branches)}
+        level_codes = {level: code for code, level in enumerate(self.all_levels)}
+        day_codes = {day: code for code, day in enumerate(self.all_days)}
+        periods = ['am', 'pm']
+        
+        # Coach availability as a coach x day x period matrix
+        availability = np.zeros((len(coach_ids), len(self.all_days), len(periods)), dtype=bool)
+        for coach_id, coach in self.coaches_data.items():
+            for day, day_code in day_codes.items():
+                for period_code, period in enumerate(periods):
+                    availability[coach_codes[coach_id], day_code, period_code] = coach['availability'][day][period]
+        
+        # Timeslots as parallel arrays
+        slot_day = np.array([day_codes[ts['day']] for ts in self.timeslots_data], dtype=np.int8)
+        slot_period = np.array([periods.index(ts['period']) for ts in self.timeslots_data], dtype=np.int8)
+        slot_columns = {field: np.array([ts[field] for ts in self.timeslots_data], dtype=ASSIGNMENT_DTYPE[field])
+                        for field in ['start_minutes', 'end_minutes', 'start_slot', 'end_slot', 'duration', 'is_popular']}
+        
+        chunks = []
         for requirement in self.requirements_data:
             req_branch = requirement['branch']
             req_level = requirement['level']
             req_duration = requirement['duration']
             
             # Find qualified coaches from data
-            qualified_coaches = []
-            for coach_id, coach in self.coaches_data.items():
-                if (req_level in coach['qualifications'] and 
-                    req_branch in coach['branches']):
-                    qualified_coaches.append(coach_id)
+            qualified_coaches = np.array([coach_codes[coach_id] for coach_id, coach in self.coaches_data.items()
+                                          if req_level in coach['qualifications'] and req_branch in coach['branches']],
+                                         dtype=np.int32)
             
             # Find matching timeslots
-            matching_timeslots = []
-            for timeslot in self.timeslots_data:
-                if (timeslot['level'] == req_level and 
-                    timeslot['duration'] == req_duration):
-                    matching_timeslots.append(timeslot)
+            matching_timeslots = np.array([i for i, timeslot in enumerate(self.timeslots_data)
+                                           if timeslot['level'] == req_level and timeslot['duration'] == req_duration],
+                                          dtype=np.intp)
             
-            # Create assignments
-            for coach_id in qualified_coaches:
-                coach = self.coaches_data[coach_id]
-                
-                for timeslot in matching_timeslots:
-                    day = timeslot['day']
-                    period = timeslot['period']
-                    
-                    # Check coach availability from data
-                    if coach['availability'][day][period]:
-                        assignments.append({
-                            'id': assignment_id,
-                            'coach_id': coach_id,
-                            'coach_name': coach['name'],
-                            'coach_status': coach['status'],
-                            'branch': req_branch,
-                            'level': req_level,
-                            'day': day,
-                            'start_time': timeslot['start_time'],
-                            'end_time': timeslot['end_time'],
-                            'duration': timeslot['duration'],
-                            'period': period,
-                            'is_popular': timeslot['is_popular'],
-                            'capacity': requirement['capacity'],
-                            'students_available': requirement['students']
-                        })
-                        assignment_id += 1
-        
-        return assignments
+            if len(qualified_coaches) == 0 or len(matching_timeslots) == 0:
+                continue
+            
+            # Coach x timeslot availability; row-major order keeps coaches outermost
+            available = availability[qualified_coaches[:, None],
+                                     slot_day[matching_timeslots][None, :],
+                                     slot_period[matching_timeslots][None, :]]
+            coach_positions, slot_positions = np.nonzero(available)
+            timeslots = matching_timeslots[slot_positions]
+            
+            chunk = np.zeros(len(timeslots), dtype=ASSIGNMENT_DTYPE)
+            chunk['coach'] = qualified_coaches[coach_positions]
+            chunk['branch'] = branch_codes[req_branch]
+            chunk['level'] = level_codes[req_level]
+            chunk['day'] = slot_day[timeslots]
+            chunk['period'] = slot_period[timeslots]
+            for field, values in slot_columns.items():
+                chunk[field] = values[timeslots]
+            chunk['capacity'] = requirement['capacity']
+            chunk['students_available'] = requirement['students']
+            chunks.append(chunk)
+        
+        rows = np.concatenate(chunks) if chunks else np.zeros(0, dtype=ASSIGNMENT_DTYPE)
+        
+        return FeasibleAssignmentStore(
+            rows,
+            coach_ids=coach_ids,
+            coach_names=[self.coaches_data[coach_id]['name'] for coach_id in coach_ids],
+            coach_statuses=[self.coaches_data[coach_id]['status'] for coach_id in coach_ids],
+            branches=list(self.all_branches),
+            levels=list(self.all_levels),
+            days=list(self.all_days),
+            periods=periods
+        )
     
     def _package_comprehensive_data(self):
         """Package all data comprehensively"""
@@ -598,26 +665,26 @@ class DataDrivenProcessor:
         
         # Calculate statistics
         total_students = sum(enrollment_dict.values())
-        popular_assignments = [a for a in self.feasible_assignments if a['is_popular']]
+        popular_count = self.feasible_assignments.popular_count()
         
         # Analyze coverage potential
-        coverage_analysis = self._analyze_coverage_potential(enrollment_dict, popular_assignments)
+        coverage_analysis = self._analyze_coverage_potential(enrollment_dict)
         
-        print(f"\nDATA-DRIVEN ANALYSIS:")
-        print(f"  Total students from enrollment data: {total_students}")
-        print(f"  Total assignments generated: {len(self.feasible_assignments)}")
+        logger.debug("DATA-DRIVEN ANALYSIS:")
+        logger.debug("  Total students from enrollment data: %s", total_students)
+        logger.debug("  Total assignments generated: %s", len(self.feasible_assignments))
         if self.feasible_assignments:
-            print(f"  Popular assignments: {len(popular_assignments)} ({len(popular_assignments)/len(self.feasible_assignments)*100:.1f}%)")
+            logger.debug("  Popular assignments: %s (%.1f%%)", popular_count, popular_count/len(self.feasible_assignments)*100)
         else:
-            print("  No feasible assignments generated - check coach qualifications and availability")
+            logger.warning("No feasible assignments generated - check coach qualifications and availability")
         
         if coverage_analysis['uncoverable_requirements']:
-            print(f"  Requirements needing attention: {len(coverage_analysis['uncoverable_requirements'])}")
+            logger.debug("  Requirements needing attention: %s", len(coverage_analysis['uncoverable_requirements']))
             for item in coverage_analysis['uncoverable_requirements'][:3]:
                 req = item['requirement']
-                print(f"    {req[0]} {req[1]}: needs {item['demand']}, popular capacity {item['capacity']}")
+                logger.debug("    %s %s: needs %s, popular capacity %s", req[0], req[1], item['demand'], item['capacity'])
         else:
-            print("  ✓ All requirements can be covered with popular timeslots")
+            logger.debug("  ✓ All requirements can be covered with popular timeslots")
         
         return {
             # Core data from database
@@ -651,11 +718,11 @@ class DataDrivenProcessor:
             'total_requirements': len(self.requirements_data),
             'total_timeslots': len(self.timeslots_data),
             'total_feasible_assignments': len(self.feasible_assignments),
-            'popular_assignments_count': len(popular_assignments),
+            'popular_assignments_count': popular_count,
             'coverage_analysis': coverage_analysis
         }
     
-    def _analyze_coverage_potential(self, enrollment_dict, popular_assignments):
+    def _analyze_coverage_potential(self, enrollment_dict):
         """Analyze coverage potential with popular assignments"""
         analysis = {
             'total_demand': sum(enrollment_dict.values()),
@@ -665,10 +732,7 @@ class DataDrivenProcessor:
         }
         
         # Calculate capacity by requirement
-        capacity_by_req = defaultdict(int)
-        for assignment in popular_assignments:
-            key = (assignment['branch'], assignment['level'])
-            capacity_by_req[key] += assignment['capacity']
+        capacity_by_req = self.feasible_assignments.capacity_by_requirement(popular_only=True)
         
         analysis['popular_capacity'] = sum(capacity_by_req.values())
         
@@ -692,12 +756,66 @@ class DataDrivenProcessor:
         
         return analysis
 
-def load_database_driven():
+def data_fingerprint(data):
+    """Stable hash of a data package, identical for identical database contents"""
+    store = data['feasible_assignments']
+    digest = hashlib.sha256(store.rows.tobytes())
+    
+    contents = {key: value for key, value in data.items() if key not in ('feasible_assignments', 'fingerprint')}
+    contents['assignment_categories'] = [store.coach_ids, store.coach_names, store.coach_statuses,
+                                         store.branches, store.levels, store.days, store.periods]
+    digest.update(json.dumps(_canonical(contents), default=str).encode())
+    
+    return digest.hexdigest()
+
+def _canonical(value):
+    """Order-independent, JSON-friendly form of nested package values"""
+    if isinstance(value, dict):
+        return sorted([repr(key), _canonical(item)] for key, item in value.items())
+    if isinstance(value, (set, frozenset)):
+        return sorted(repr(item) for item in value)
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+# Last packaged data, reused while the stored data version is unchanged
+_package_cache = {'key': None, 'data': None}
+_package_cache_lock = threading.Lock()
+
+def get_data_version():
+    """Current version of the scheduling input data"""
+    row = db.session.get(DataVersion, 1)
+    return row.version if row else 0
+
+def bump_data_version():
+    """Mark the scheduling input data as changed; committed with the caller's write"""
+    updated = db.session.query(DataVersion).filter_by(id=1).update({DataVersion.version: DataVersion.version + 1})
+    if not updated:
+        db.session.add(DataVersion(id=1, version=1))
+
+def load_database_driven(use_cache=True):
     """
     Load data using completely data-driven processor from database
     
+    The packaged data is cached per process and shared between callers, so it
+    must be treated as read-only. It is rebuilt when the data version changes.
+    
     Returns:
         Complete data package with everything extracted from database
     """
-    processor = DataDrivenProcessor()
-    return processor.load_and_process_data()
\ No newline at end of file
+    if not use_cache:
+        return DataDrivenProcessor().load_and_process_data()
+    
+    key = (str(db.engine.url), get_data_version())
+    with _package_cache_lock:
+        if _package_cache['key'] == key:
+            logger.debug("Using cached data package (data version %s)", key[1])
+            return _package_cache['data']
+        
+        data = DataDrivenProcessor().load_and_process_data()
+        if data:
+            _package_cache['key'] = key
+            _package_cache['data'] = data
+        return data
\ No newline at end of file
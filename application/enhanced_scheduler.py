@@ -1,8 +1,21 @@
-import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
-from collections import defaultdict
+import pandas as pd
+from collections import defaultdict, deque, Counter
+import math
+import os
+import pickle
 import random
+import time
+import logging
+import uuid
+from concurrent.futures import TimeoutError as FutureTimeoutError, wait as wait_for_futures
+
+from application.assignment_store import CandidateBatch
+from application.jobs import WorkerPool
+from application.scheduler_state import SchedulerState
+from application.time_utils import slot_mask, time_to_minutes
+
+logger = logging.getLogger(__name__)
 
 class EnhancedStrictConstraintScheduler:
     """
@@ -15,6 +28,7 @@ class EnhancedStrictConstraintScheduler:
     4. Multi-level combinations for complex gaps
     5. Exhaustive assignment using all available resources
     6. Maximum utilization within strict constraints
+    7. Large neighbourhood search: destroy and repair parts of the schedule, keeping improvements
     """
     
     # ==================== EDITABLE CONFIGURATION ====================
@@ -40,6 +54,12 @@ class EnhancedStrictConstraintScheduler:
     MAX_ITERATIONS = 60            # Number of optimization iterations
     SHUFFLE_INTERVAL = 5           # Shuffle assignments every N iterations
     MAX_ASSIGNMENT_ATTEMPTS = 20   # Max attempts per requirement
+    TIME_LIMIT_SECONDS = 0         # Stop starting new iterations after this many seconds (0 = no limit)
+    PATIENCE = 0                   # Stop after N iterations without a new best result (0 = disabled)
+    RANDOM_SEED = None             # Seed for adaptive shuffling (None = random each run)
+    PARALLEL_WORKERS = 1           # Worker processes for iterations (1 = run serially)
+    LNS_MAX_MOVES = 20             # Destroy-and-repair moves refining each iteration's schedule (0 = disabled)
+    LNS_TIME_BUDGET = 1.0          # Max seconds of destroy-and-repair moves per iteration (0 = no limit)
     
     # Scoring Weights (1-10 scale, higher = more preferred)
     WEEKEND_BIAS = 5               # Weekend preference (1-10)
@@ -58,34 +78,104 @@ class EnhancedStrictConstraintScheduler:
     _CAPACITY_MULTIPLIER = 2.0     # Default capacity multiplier value
     _PEAK_HOURS_BONUS = 8          # Priority for 10AM-3PM slots
     _GOOD_HOURS_BONUS = 6          # Priority for 9AM-5PM slots
+    _MAX_PARALLEL_WORKERS = os.cpu_count() or 1  # PARALLEL_WORKERS is capped here
     
     # ==================== END EDITABLE CONFIGURATION ====================
     
-    def __init__(self, data, config:dict =None):
+    # Settings that change how long a search runs but never what a completed search returns
+    _EXECUTION_SETTINGS = ('PARALLEL_WORKERS', 'TIME_LIMIT_SECONDS', 'LNS_TIME_BUDGET')
+    
+    # Numeric settings coerced when a config is applied, with their type and minimum (None = unbounded);
+    # None falls back to the class default
+    _NUMERIC_SETTINGS = {
+        'TIME_LIMIT_SECONDS': (float, 0),
+        'PATIENCE': (int, 0),
+        'PARALLEL_WORKERS': (int, 1),
+        'LNS_MAX_MOVES': (int, None),
+        'LNS_TIME_BUDGET': (float, None),
+    }
+    
+    # Constraints a candidate can fail in validation, in the order they are checked
+    _REJECTION_REASONS = ('availability', 'time_conflict', 'branch_per_day', 'daily_limit',
+                          'daily_hours', 'consecutive_limit', 'branch_capacity')
+    
+    @classmethod
+    def result_config(cls, config:dict =None):
+        """Effective settings that determine the result, for comparing or caching runs"""
+        settings = {key: getattr(cls, key) for key in dir(cls)
+                    if key.isupper() and not key.startswith('_') and key not in cls._EXECUTION_SETTINGS}
+        
+        for key, value in cls.coerce_config(config).items():
+            if key.upper() in settings:
+                # Form values may arrive as floats, e.g. 5.0 for 5
+                if isinstance(value, float) and value.is_integer():
+                    value = int(value)
+                settings[key.upper()] = value
+        
+        return settings
+    
+    @classmethod
+    def coerce_config(cls, config:dict =None):
+        """Config with numeric settings converted to their types; raises ValueError for invalid values"""
+        return {key: cls._coerce_setting(key.upper(), value) for key, value in (config or {}).items()}
+    
+    @classmethod
+    def _coerce_setting(cls, key, value):
+        """Convert a numeric setting to its type, using the class default for None; rejects invalid values"""
+        if key not in cls._NUMERIC_SETTINGS:
+            return value
+        convert, minimum = cls._NUMERIC_SETTINGS[key]
+        if value is None:
+            return getattr(cls, key)
+        try:
+            number = float(value) if not isinstance(value, bool) else None
+        except (TypeError, ValueError):
+            number = None
+        if number is None or not math.isfinite(number) or (convert is int and not number.is_integer()):
+            raise ValueError(f"{key.lower()} must be {'a whole number' if convert is int else 'a number'}, got {value!r}")
+        if minimum is not None and number < minimum:
+            raise ValueError(f"{key.lower()} must be at least {minimum}, got {value!r}")
+        return convert(number)
+    
+    def __init__(self, data, config:dict =None, progress_callback=None, cancel_event=None, worker_pool=None):
         if config:
-            for key, value in config.items():
+            for key, value in self.coerce_config(config).items():
                 if hasattr(self, key.upper()):
                     setattr(self, key.upper(), value)
         
-        print("ENHANCED STRICT CONSTRAINT SCHEDULER")
-        print("Target: Maximum student assignment with strict workload limits")
-        print(f"STRICT LIMIT: Max {self.WEEKEND_DAILY_LIMIT} classes per coach per weekend day")
-        print(f"STRICT LIMIT: Max {self.WEEKDAY_DAILY_LIMIT} classes per coach per weekday")
+        if self.PARALLEL_WORKERS > self._MAX_PARALLEL_WORKERS:
+            logger.warning("Using %s worker processes instead of the %s requested", self._MAX_PARALLEL_WORKERS, self.PARALLEL_WORKERS)
+            self.PARALLEL_WORKERS = self._MAX_PARALLEL_WORKERS
+        
+        logger.debug("ENHANCED STRICT CONSTRAINT SCHEDULER")
+        logger.debug("Target: Maximum student assignment with strict workload limits")
+        logger.debug("STRICT LIMIT: Max %s classes per coach per weekend day", self.WEEKEND_DAILY_LIMIT)
+        logger.debug("STRICT LIMIT: Max %s classes per coach per weekday", self.WEEKDAY_DAILY_LIMIT)
 
         self.data = data
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+        self.worker_pool = worker_pool
         self.enrollment_dict = data['enrollment_dict']
         self.coaches_data = data['coaches_data']
         self.feasible_assignments = data['feasible_assignments']
         
-        # Use only popular assignments
-        self.popular_assignments = [a for a in self.feasible_assignments if a.get('is_popular', False)]
+        # Use only popular assignments, read through row views of the columnar store
+        self.popular_assignments = self.feasible_assignments.select(self.feasible_assignments.popular_indices())
         
         if len(self.popular_assignments) == 0:
-            print("WARNING: No popular assignments found. Using all feasible assignments.")
-            self.popular_assignments = self.feasible_assignments
+            logger.warning("No popular assignments found. Using all feasible assignments.")
+            self.popular_assignments = self.feasible_assignments.select()
+        
+        logger.debug("Popular assignments available: %s", len(self.popular_assignments))
+        logger.debug("Only using popular timeslots for scheduling")
+        
+        # Index popular assignments for constant-time candidate lookup
+        self._build_candidate_index()
         
-        print(f"Popular assignments available: {len(self.popular_assignments)}")
-        print(f"Only using popular timeslots for scheduling")
+        # Seeded shuffling lets any iteration's ordering be replayed from the initial one
+        self._rng = random.Random(self.RANDOM_SEED)
+        self._shuffles_applied = 0
         
         # Load constraints and hierarchy
         self.class_capacities = data['class_capacities']
@@ -94,6 +184,10 @@ class EnhancedStrictConstraintScheduler:
         self.weekdays = data['weekdays']
         self.weekends = data['weekends']
         
+        # Positions of branches and days in the branch occupancy grid
+        self.branch_index = {branch: i for i, branch in enumerate(data['all_branches'])}
+        self.day_index = {day: i for i, day in enumerate(data['all_days'])}
+        
         # Define programs for the same_program_back_to_back penalty
         self.program_groups = {
             'Tots': 'Tots',
@@ -118,19 +212,30 @@ class EnhancedStrictConstraintScheduler:
         self.full_time_coaches = [c for c in self.coaches_data.values() if c['status'] == 'Full Time']
         self.part_time_coaches = [c for c in self.coaches_data.values() if c['status'] == 'Part Time']
         self.branch_managers = [c for c in self.coaches_data.values() if c['status'] == 'Branch Manager']
+        self._initial_order = (list(self.popular_assignments), list(self.full_time_coaches),
+                               list(self.part_time_coaches), list(self.branch_managers))
+        
+        # Qualification matrix and scarcity scores are fixed for the whole run
+        self._build_qualification_tables()
+        
+        # State-independent part of each assignment's score, fixed for the whole run
+        self.full_time_coach_ids = {c['id'] for c in self.full_time_coaches}
+        self.static_scores = {a['id']: self._static_assignment_score(a) for a in self.popular_assignments}
+        
+        # Limits and flags by store code, for checking and scoring candidates in batches
+        self._build_batch_tables()
         
-        print(f"Total students to schedule: {self.total_students_required}")
-        print(f"Coaches: {len(self.full_time_coaches)} FT, {len(self.part_time_coaches)} PT, {len(self.branch_managers)} MGR")
+        logger.debug("Total students to schedule: %s", self.total_students_required)
+        logger.debug("Coaches: %s FT, %s PT, %s MGR", len(self.full_time_coaches), len(self.part_time_coaches), len(self.branch_managers))
         
         self._analyze_enrollment_requirements()
         
         # Calculate theoretical capacity
         self.theoretical_capacity = self._calculate_theoretical_capacity()
-        print(f"Theoretical maximum capacity (strict limits): {self.theoretical_capacity}")
+        logger.debug("Theoretical maximum capacity (strict limits): %s", self.theoretical_capacity)
         
         if self.theoretical_capacity < self.total_students_required:
-            print("WARNING: Theoretical capacity insufficient with strict workload limits")
-            print("Will maximize coverage within constraints")
+            logger.warning("Theoretical capacity insufficient with strict workload limits, maximizing coverage within constraints")
         
         # Normalize priority weights for calculations (scale of 0-10 to proportions)
         total_weight = self.SCARCITY_WEIGHT + self.COMPLEXITY_WEIGHT + self.SIZE_WEIGHT
@@ -146,124 +251,339 @@ class EnhancedStrictConstraintScheduler:
     
     def _analyze_enrollment_requirements(self):
         """Analyze enrollment requirements and identify potential bottlenecks"""
-        print("\nAnalyzing enrollment requirements:")
+        logger.debug("Analyzing enrollment requirements:")
         
+        critical_shortages = 0
         for req_key, students in self.enrollment_dict.items():
             branch, level = req_key
             
-            qualified_coaches = len([c for c in self.full_time_coaches + self.part_time_coaches + self.branch_managers
-                                   if level in c['qualifications'] and branch in c['branches']])
+            qualified_coaches = len(self.qualified_coach_ids.get(req_key, ()))
+            popular_slots = self.popular_slot_counts[req_key]
             
-            popular_slots = len([a for a in self.popular_assignments 
-                               if a['branch'] == branch and a['level'] == level])
-            
-            print(f"  {branch} {level}: {students} students, {qualified_coaches} coaches, {popular_slots} popular slots")
+            logger.debug("  %s %s: %s students, %s coaches, %s popular slots", branch, level, students, qualified_coaches, popular_slots)
             
             if students > 0 and (qualified_coaches == 0 or popular_slots == 0):
-                print(f"    WARNING: Critical shortage for {branch} {level}")
+                logger.debug("Critical shortage for %s %s", branch, level)
+                critical_shortages += 1
+        
+        if critical_shortages:
+            logger.warning("Critical shortage for %s of %s requirements (no qualified coaches or popular slots)", critical_shortages, len(self.enrollment_dict))
     
     def schedule_with_complete_coverage(self):
         """Main scheduling algorithm with strict constraint enforcement"""
-        print("\nStarting enhanced scheduling with strict workload enforcement...")
-        print(f"CONSTRAINT: Never exceed {self.WEEKEND_DAILY_LIMIT} weekend / {self.WEEKDAY_DAILY_LIMIT} weekday classes per coach per day")
-        print("STRATEGY: Maximize coverage within absolute limits")
-        print("NOTE: Only using popular timeslots for scheduling")
+        logger.info("Starting enhanced scheduling with strict workload enforcement...")
+        logger.debug("CONSTRAINT: Never exceed %s weekend / %s weekday classes per coach per day", self.WEEKEND_DAILY_LIMIT, self.WEEKDAY_DAILY_LIMIT)
+        logger.debug("STRATEGY: Maximize coverage within absolute limits")
+        logger.debug("NOTE: Only using popular timeslots for scheduling")
         
         best_result = None
         best_coverage = 0
         
-        for iteration in range(1, self.MAX_ITERATIONS + 1):
-            print(f"\nITERATION {iteration}")
-            print("-" * 40)
-            
-            state = self._initialize_enhanced_state()
-            
-            # Always use popular slots only
-            assignment_pool = self.popular_assignments
-            print(f"Using POPULAR slots only for maximum coverage")
-            
-            # Execute six-phase optimization
-            self._phase1_enhanced_systematic(state, assignment_pool)
-            self._phase2_enhanced_gap_filling(state, assignment_pool)
-            self._phase3_enhanced_merging(state)
-            self._phase4_multi_level_merging(state, assignment_pool)
-            self._phase5_exhaustive_assignment(state, assignment_pool)
-            self._phase6_maximum_utilization_strict(state, assignment_pool)
+        search_start = time.monotonic()
+        iterations_run = 0
+        iterations_without_improvement = 0
+        stop_reason = 'max_iterations'
+        profile = self._new_search_profile()
+        
+        if self.PARALLEL_WORKERS > 1:
+            iterations = self._parallel_iterations()
+        else:
+            iterations = self._serial_iterations()
+        
+        for iteration, outcome in iterations:
+            # A cancelled iteration is abandoned part-way and never considered
+            if outcome is None:
+                logger.info("STOPPING: cancelled during iteration %s", iteration)
+                stop_reason = 'cancelled'
+                break
             
-            # Validate and score result
-            result = self._build_and_validate_result(state)
+            iterations_run = iteration
+            result, violations, workload_violations = outcome
             coverage = result['statistics']['coverage_percentage']
-            violations = self._count_violations(result)
-            workload_violations = self._count_workload_violations(result)
+            self._add_to_search_profile(profile, result['statistics']['profile'])
             
-            print(f"Result: {coverage:.1f}% coverage, {violations} violations, {workload_violations} workload violations")
+            logger.debug("Result: %.1f%% coverage, %s violations, %s workload violations", coverage, violations, workload_violations)
             
             # Accept only zero-violation results
             if violations == 0 and workload_violations == 0 and coverage > best_coverage:
                 best_result = result
                 best_coverage = coverage
-                print(f"New best VALID result: {coverage:.1f}% (strict limits enforced)")
-            elif workload_violations > 0:
-                print(f"REJECTED: {workload_violations} workload limit violations")
-            elif violations > 0:
-                print(f"REJECTED: {violations} other constraint violations")
+                iterations_without_improvement = 0
+                logger.debug("New best VALID result: %.1f%% (strict limits enforced)", coverage)
+                self._emit('new_best', iteration=iteration, coverage=coverage, result=result)
+            else:
+                iterations_without_improvement += 1
+                if workload_violations > 0:
+                    logger.debug("REJECTED: %s workload limit violations", workload_violations)
+                elif violations > 0:
+                    logger.debug("REJECTED: %s other constraint violations", violations)
+            
+            self._emit('iteration_complete', iteration=iteration, max_iterations=self.MAX_ITERATIONS,
+                       coverage=coverage, best_coverage=best_coverage,
+                       violations=violations, workload_violations=workload_violations)
             
             # Check for perfect solution
             if coverage >= 100.0 and violations == 0 and workload_violations == 0:
-                print("100% coverage with zero violations achieved - SUCCESS")
+                logger.info("100% coverage with zero violations achieved - SUCCESS")
+                stop_reason = 'perfect_coverage'
                 break
             
             # Report remaining gaps
-            gaps = self._identify_gaps(result)
+            gaps = self._identify_gaps(result) if logger.isEnabledFor(logging.DEBUG) else None
             if gaps:
                 unassigned_total = sum(gap for _, gap in gaps)
-                print(f"Remaining unassigned: {unassigned_total} students")
+                logger.debug("Remaining unassigned: %s students", unassigned_total)
                 if len(gaps) <= 5:
-                    print("Critical gaps:")
+                    logger.debug("Critical gaps:")
                     for req_key, gap in gaps:
-                        print(f"  {req_key[0]} {req_key[1]}: {gap} students")
+                        logger.debug("  %s %s: %s students", req_key[0], req_key[1], gap)
             
-            # Periodic shuffling for better exploration
-            if iteration % self.SHUFFLE_INTERVAL == 0:
-                self._enhanced_adaptive_shuffle()
+            # Early stopping on stalled search or exhausted time budget
+            if self.PATIENCE and iterations_without_improvement >= self.PATIENCE:
+                logger.info("STOPPING: no improvement in %s iterations", iterations_without_improvement)
+                stop_reason = 'patience'
+                break
+            
+            if self.TIME_LIMIT_SECONDS and time.monotonic() - search_start >= self.TIME_LIMIT_SECONDS:
+                logger.info("STOPPING: time limit of %ss reached", self.TIME_LIMIT_SECONDS)
+                stop_reason = 'time_limit'
+                break
+            
+            if self._cancel_requested():
+                logger.info("STOPPING: cancelled")
+                stop_reason = 'cancelled'
+                break
+        
+        iterations.close()
         
         # Return best valid result or fallback
         final_result = best_result if best_result else self._create_best_effort_strict_result()
         final_coverage = final_result['statistics']['coverage_percentage']
+        final_result['statistics']['search'] = {
+            'stop_reason': stop_reason,
+            'iterations_run': iterations_run,
+            'elapsed_seconds': time.monotonic() - search_start
+        }
+        final_result['statistics']['profile'] = profile
         
-        print(f"\nFINAL RESULT: {final_coverage:.1f}% coverage with strict workload limits")
+        logger.info("FINAL RESULT: %.1f%% coverage with strict workload limits", final_coverage)
         
         if final_coverage >= 100.0:
-            print("SUCCESS: 100% coverage within strict workload limits")
+            logger.info("SUCCESS: 100% coverage within strict workload limits")
         else:
             remaining = final_result['statistics']['total_students_required'] - final_result['statistics']['total_students_scheduled']
-            print(f"RESULT: {remaining} students unassigned due to strict workload constraints")
-            print("GUARANTEE: All workload limits strictly respected")
-            print("\nPossible solutions to improve coverage:")
-            print("1. Increase WEEKEND_DAILY_LIMIT (currently " + str(self.WEEKEND_DAILY_LIMIT) + ")")
-            print("2. Increase WEEKDAY_DAILY_LIMIT (currently " + str(self.WEEKDAY_DAILY_LIMIT) + ")")
-            print("3. Increase weekly limits (especially for full-time coaches)")
-            print("4. Adjust CONSECUTIVE_LIMIT to allow more classes in succession")
-        
-        # Print detailed summary of the scheduling results
-        self._print_scheduling_summary(final_result)
+            logger.info("RESULT: %s students unassigned due to strict workload constraints", remaining)
+            logger.debug("GUARANTEE: All workload limits strictly respected")
+            logger.debug("Possible solutions to improve coverage:")
+            logger.debug("1. Increase WEEKEND_DAILY_LIMIT (currently %s)", self.WEEKEND_DAILY_LIMIT)
+            logger.debug("2. Increase WEEKDAY_DAILY_LIMIT (currently %s)", self.WEEKDAY_DAILY_LIMIT)
+            logger.debug("3. Increase weekly limits (especially for full-time coaches)")
+            logger.debug("4. Adjust CONSECUTIVE_LIMIT to allow more classes in succession")
+        
+        # Log detailed summary of the scheduling results
+        if logger.isEnabledFor(logging.DEBUG):
+            self._log_scheduling_summary(final_result)
         
         return final_result
     
-    def _print_scheduling_summary(self, result):
-        """Print comprehensive summary of scheduling results"""
-        print("\n" + "="*80)
-        print("SCHEDULING SUMMARY")
-        print("="*80)
+    def _run_iteration(self, iteration):
+        """Run one seven-phase pass from an empty state and validate the result
+        
+        Returns None if cancellation is requested before the pass completes.
+        """
+        if self._cancel_requested():
+            return None
+        
+        logger.debug("ITERATION %s", iteration)
+        
+        self._emit('iteration_start', iteration=iteration, max_iterations=self.MAX_ITERATIONS)
+        
+        state = self._initialize_enhanced_state()
+        
+        # Always use popular slots only
+        assignment_pool = self.popular_assignments
+        logger.debug("Using POPULAR slots only for maximum coverage")
+        
+        # Execute seven-phase optimization
+        phases = [
+            ('systematic', self._phase1_enhanced_systematic, (state, assignment_pool)),
+            ('gap_filling', self._phase2_enhanced_gap_filling, (state, assignment_pool)),
+            ('merging', self._phase3_enhanced_merging, (state,)),
+            ('multi_level_merging', self._phase4_multi_level_merging, (state, assignment_pool)),
+            ('exhaustive', self._phase5_exhaustive_assignment, (state, assignment_pool)),
+            ('maximum_utilization', self._phase6_maximum_utilization_strict, (state, assignment_pool)),
+            ('large_neighbourhood_search', self._phase7_large_neighbourhood_search, (state, assignment_pool, iteration))
+        ]
+        phase_summaries = []
+        phase_seconds = {}
+        classes_before = students_before = 0
+        iteration_start = time.perf_counter()
+        
+        for phase, (name, run_phase, args) in enumerate(phases, start=1):
+            phase_start = time.perf_counter()
+            run_phase(*args)
+            phase_seconds[name] = time.perf_counter() - phase_start
+            
+            classes_after = len(state.selected_assignments)
+            students_after = sum(assignment['actual_students'] for assignment in state.selected_assignments)
+            coverage = students_after / self.total_students_required * 100 if self.total_students_required else 0
+            phase_summaries.append({
+                'phase': phase,
+                'name': name,
+                'classes_added': classes_after - classes_before,
+                'students_added': students_after - students_before,
+                'coverage_percentage': coverage
+            })
+            classes_before, students_before = classes_after, students_after
+            
+            logger.debug("  Phase %s Complete: %.1f%% total coverage", phase, coverage)
+            self._emit('phase_complete', iteration=iteration, phase=phase, coverage=coverage)
+            if self._cancel_requested():
+                return None
+        
+        # Validate and score result
+        result = self._build_and_validate_result(state)
+        result['statistics']['phases'] = phase_summaries
+        if state.lns is not None:
+            result['statistics']['lns'] = state.lns
+        violations = self._count_violations(result)
+        workload_violations = self._count_workload_violations(result)
+        
+        result['statistics']['profile'] = {
+            'iteration_seconds': time.perf_counter() - iteration_start,
+            'phase_seconds': phase_seconds,
+            'counters': dict(state.counters),
+            'rejections': dict(state.rejections)
+        }
+        
+        return result, violations, workload_violations
+    
+    def _new_search_profile(self):
+        return {
+            'iterations': 0,
+            'iteration_seconds': [],
+            'phase_seconds': {},
+            'counters': {'candidates_examined': 0, 'validations': 0, 'coaches_at_weekly_limit': 0},
+            'rejections': {reason: 0 for reason in self._REJECTION_REASONS}
+        }
+    
+    def _add_to_search_profile(self, profile, iteration_profile):
+        """Fold one iteration's timings and counters into the whole-search profile"""
+        profile['iterations'] += 1
+        profile['iteration_seconds'].append(iteration_profile['iteration_seconds'])
+        
+        for totals, values in ((profile['phase_seconds'], iteration_profile['phase_seconds']),
+                               (profile['counters'], iteration_profile['counters']),
+                               (profile['rejections'], iteration_profile['rejections'])):
+            for key, value in values.items():
+                totals[key] = totals.get(key, 0) + value
+    
+    def _cancel_requested(self):
+        return self.cancel_event is not None and self.cancel_event.is_set()
+    
+    def _emit(self, event_type, **data):
+        """Send a structured progress event to the progress callback, if any"""
+        if self.progress_callback:
+            self.progress_callback({'type': event_type, **data})
+    
+    def _serial_iterations(self):
+        """Yield (iteration, outcome) pairs, running each iteration in this process"""
+        for iteration in range(1, self.MAX_ITERATIONS + 1):
+            yield iteration, self._run_iteration(iteration)
+            
+            # Periodic shuffling for better exploration
+            if iteration % self.SHUFFLE_INTERVAL == 0:
+                self._enhanced_adaptive_shuffle()
+    
+    def _parallel_iterations(self):
+        """Yield (iteration, outcome) pairs in order, running iterations on worker processes
+        
+        Every worker gets the same explicit seed and replays the shuffles an iteration
+        would have seen in a serial run, so the outcomes match a serial run with that seed.
+        At most PARALLEL_WORKERS iterations are queued or running at a time.
+        
+        Workers share a stop event and check it between phases. It is set when the search
+        stops early or is cancelled, so running iterations end instead of finishing.
+        Iterations run on worker_pool when given, otherwise on a pool started for this search.
+        """
+        seed = self.RANDOM_SEED if self.RANDOM_SEED is not None else random.randrange(2 ** 32)
+        self._reset_shuffle_order(seed)
+        
+        config = {key: getattr(self, key) for key in dir(self) if key.isupper() and not key.startswith('_')}
+        config['RANDOM_SEED'] = seed
+        config['PARALLEL_WORKERS'] = 1  # Workers run their iterations serially
+        
+        pool = self.worker_pool or WorkerPool(self.PARALLEL_WORKERS)
+        workers = min(self.PARALLEL_WORKERS, pool.max_workers)
+        logger.info("Running iterations on %s worker processes (seed %s)", workers, seed)
+        
+        # Workers build their scheduler once per search, from the payload sent with each iteration
+        search = (uuid.uuid4().hex, pickle.dumps((self.data, config)), pool.event())
+        pending = deque()
+        try:
+            for iteration in range(1, self.MAX_ITERATIONS + 1):
+                while len(pending) < workers and iteration + len(pending) <= self.MAX_ITERATIONS:
+                    queued = iteration + len(pending)
+                    pending.append(pool.submit(_run_iteration_in_worker, search, queued,
+                                               (queued - 1) // self.SHUFFLE_INTERVAL))
+                
+                # Relay a job cancel to the workers while waiting; the iteration then yields None
+                future = pending.popleft()
+                while True:
+                    try:
+                        outcome = future.result(timeout=0.1)
+                        break
+                    except FutureTimeoutError:
+                        if self._cancel_requested():
+                            search[2].set()
+                
+                yield iteration, outcome
+                
+                # Keep this process's ordering in step with a serial run
+                if iteration % self.SHUFFLE_INTERVAL == 0:
+                    self._enhanced_adaptive_shuffle()
+        finally:
+            # Queued iterations are dropped, running ones stop after their current phase
+            search[2].set()
+            for future in pending:
+                future.cancel()
+            wait_for_futures(pending)
+            if pool is not self.worker_pool:
+                pool.shutdown()
+    
+    def _reset_shuffle_order(self, seed):
+        """Restore the initial assignment and coach ordering and reseed shuffling"""
+        popular, full_time, part_time, managers = self._initial_order
+        self.popular_assignments = list(popular)
+        self.full_time_coaches = list(full_time)
+        self.part_time_coaches = list(part_time)
+        self.branch_managers = list(managers)
+        self._build_candidate_index()
+        self._build_qualified_coach_lists()
+        
+        self._rng = random.Random(seed)
+        self._shuffles_applied = 0
+    
+    def _replay_shuffles(self, shuffle_count):
+        """Bring the ordering to where it is after shuffle_count adaptive shuffles"""
+        if shuffle_count < self._shuffles_applied:
+            self._reset_shuffle_order(self.RANDOM_SEED)
+        
+        while self._shuffles_applied < shuffle_count:
+            self._enhanced_adaptive_shuffle()
+    
+    def _log_scheduling_summary(self, result):
+        """Log comprehensive summary of scheduling results"""
+        logger.debug("SCHEDULING SUMMARY")
         
         stats = result['statistics']
         schedule = result['schedule']
         
         # Overall statistics
-        print(f"Total Students Scheduled: {stats['total_students_scheduled']} of {stats['total_students_required']} ({stats['coverage_percentage']:.1f}%)")
-        print(f"Total Classes Scheduled: {stats['total_classes']}")
-        print(f"Popular Timeslots Used: {stats['popular_slots_used']} of {stats['total_slots']} classes ({stats['popular_slots_used']/max(1, stats['total_slots'])*100:.1f}%)")
-        print(f"Merged Classes: {stats['merged_classes']}")
+        logger.debug("Total Students Scheduled: %s of %s (%.1f%%)", stats['total_students_scheduled'], stats['total_students_required'], stats['coverage_percentage'])
+        logger.debug("Total Classes Scheduled: %s", stats['total_classes'])
+        logger.debug("Popular Timeslots Used: %s of %s classes (%.1f%%)", stats['popular_slots_used'], stats['total_slots'], stats['popular_slots_used']/max(1, stats['total_slots'])*100)
+        logger.debug("Merged Classes: %s", stats['merged_classes'])
         
         # Branch distribution
         branch_classes = {}
@@ -276,11 +596,11 @@ class EnhancedStrictConstraintScheduler:
             branch_classes[branch] += 1
             branch_students[branch] += entry['Students']
         
-        print("\nBranch Distribution:")
+        logger.debug("Branch Distribution:")
         for branch in sorted(branch_classes.keys()):
             class_count = branch_classes[branch]
             student_count = branch_students[branch]
-            print(f"  {branch}: {class_count} classes, {student_count} students")
+            logger.debug("  %s: %s classes, %s students", branch, class_count, student_count)
         
         # Coach utilization
         coach_usage = {}
@@ -317,18 +637,18 @@ class EnhancedStrictConstraintScheduler:
         part_time_coaches.sort(key=lambda x: x[1]['classes'], reverse=True)
         branch_managers.sort(key=lambda x: x[1]['classes'], reverse=True)
         
-        print("\nCoach Utilization:")
-        print("  Full Time Coaches:")
+        logger.debug("Coach Utilization:")
+        logger.debug("  Full Time Coaches:")
         for coach_id, data in full_time_coaches:
-            print(f"    {data['name']} (ID {coach_id}): {data['classes']} classes, {data['students']} students")
+            logger.debug("    %s (ID %s): %s classes, %s students", data['name'], coach_id, data['classes'], data['students'])
         
-        print("  Part Time Coaches:")
+        logger.debug("  Part Time Coaches:")
         for coach_id, data in part_time_coaches:
-            print(f"    {data['name']} (ID {coach_id}): {data['classes']} classes, {data['students']} students")
+            logger.debug("    %s (ID %s): %s classes, %s students", data['name'], coach_id, data['classes'], data['students'])
         
-        print("  Branch Managers:")
+        logger.debug("  Branch Managers:")
         for coach_id, data in branch_managers:
-            print(f"    {data['name']} (ID {coach_id}): {data['classes']} classes, {data['students']} students")
+            logger.debug("    %s (ID %s): %s classes, %s students", data['name'], coach_id, data['classes'], data['students'])
         
         # Level distribution
         level_distribution = {}
@@ -339,10 +659,10 @@ class EnhancedStrictConstraintScheduler:
             level_distribution[level]['classes'] += 1
             level_distribution[level]['students'] += entry['Students']
         
-        print("\nLevel Distribution:")
+        logger.debug("Level Distribution:")
         for level in self.level_hierarchy:
             if level in level_distribution:
-                print(f"  {level}: {level_distribution[level]['classes']} classes, {level_distribution[level]['students']} students")
+                logger.debug("  %s: %s classes, %s students", level, level_distribution[level]['classes'], level_distribution[level]['students'])
         
         # Day distribution
         day_distribution = {}
@@ -353,9 +673,9 @@ class EnhancedStrictConstraintScheduler:
             day_distribution[day]['classes'] += 1
             day_distribution[day]['students'] += entry['Students']
         
-        print("\nDay Distribution:")
+        logger.debug("Day Distribution:")
         for day in sorted(day_distribution.keys()):
-            print(f"  {day}: {day_distribution[day]['classes']} classes, {day_distribution[day]['students']} students")
+            logger.debug("  %s: %s classes, %s students", day, day_distribution[day]['classes'], day_distribution[day]['students'])
         
         # Calculate time distribution
         morning_classes = 0
@@ -373,23 +693,22 @@ class EnhancedStrictConstraintScheduler:
             else:
                 evening_classes += 1
         
-        print("\nTime Distribution:")
-        print(f"  Morning (before 12PM): {morning_classes} classes")
-        print(f"  Afternoon (12-5PM): {afternoon_classes} classes")
-        print(f"  Evening (after 5PM): {evening_classes} classes")
+        logger.debug("Time Distribution:")
+        logger.debug("  Morning (before 12PM): %s classes", morning_classes)
+        logger.debug("  Afternoon (12-5PM): %s classes", afternoon_classes)
+        logger.debug("  Evening (after 5PM): %s classes", evening_classes)
         
         # Check for same-program back-to-back classes on weekday mornings
         same_program_b2b = self._count_same_program_back_to_back(schedule)
         if same_program_b2b:
-            print("\nSame Program Back-to-Back Classes on Weekday Mornings:")
+            logger.debug("Same Program Back-to-Back Classes on Weekday Mornings:")
             for item in same_program_b2b[:5]:  # Show top 5
                 branch, day, program, start_times = item
-                print(f"  {branch} {day}: {program} program at {', '.join(start_times)}")
+                logger.debug("  %s %s: %s program at %s", branch, day, program, ', '.join(start_times))
             
             if len(same_program_b2b) > 5:
-                print(f"  ...and {len(same_program_b2b) - 5} more instances")
+                logger.debug("  ...and %s more instances", len(same_program_b2b) - 5)
         
-        print("="*80)
     
     def _count_same_program_back_to_back(self, schedule):
         """Count instances of same program back-to-back classes on weekday mornings"""
@@ -465,26 +784,11 @@ class EnhancedStrictConstraintScheduler:
     
     def _initialize_enhanced_state(self):
         """Initialize state tracking for scheduling iteration"""
-        return {
-            'selected_assignments': [],
-            'coach_schedules': defaultdict(lambda: defaultdict(list)),
-            'coach_daily_hours': defaultdict(lambda: defaultdict(int)),
-            'coach_daily_classes': defaultdict(lambda: defaultdict(int)),
-            'coach_branch_daily': defaultdict(lambda: defaultdict(str)),
-            'branch_time_usage': defaultdict(lambda: defaultdict(lambda: defaultdict(int))),
-            'requirement_coverage': defaultdict(int),
-            'coach_workload': defaultdict(int),
-            'coach_levels_taught': defaultdict(set),  # Track diversity of levels taught
-            'unassigned_students': dict(self.enrollment_dict),
-            'critical_gaps': [],
-            'resource_utilization': defaultdict(float),
-            'assignment_attempts': defaultdict(int),
-            'coach_program_morning_classes': defaultdict(lambda: defaultdict(lambda: defaultdict(list)))  # Track morning program classes
-        }
+        return SchedulerState(self)
     
     def _phase1_enhanced_systematic(self, state, assignment_pool):
         """Phase 1: Systematic assignment by priority with strict constraint enforcement"""
-        print("Phase 1: Enhanced systematic assignment (strict workload limits)")
+        logger.debug("Phase 1: Enhanced systematic assignment (strict workload limits)")
         
         sorted_requirements = self._get_enhanced_priority_requirements()
         
@@ -493,7 +797,7 @@ class EnhancedStrictConstraintScheduler:
             students_needed = requirement['students']
             max_capacity = self.class_capacities.get(level, 8)
             
-            print(f"  Processing {branch} {level}: {students_needed} students")
+            logger.debug("  Processing %s %s: %s students", branch, level, students_needed)
             
             students_assigned = 0
             qualified_coaches = self._get_prioritized_coaches(branch, level)
@@ -504,7 +808,7 @@ class EnhancedStrictConstraintScheduler:
                 assignment = self._find_optimal_assignment_strict(qualified_coaches, branch, level, state, assignment_pool)
                 
                 if not assignment:
-                    print(f"    No valid assignment found on attempt {attempts} (strict limits)")
+                    logger.debug("    No valid assignment found on attempt %s (strict limits)", attempts)
                     break
                 
                 remaining_students = students_needed - students_assigned
@@ -512,37 +816,33 @@ class EnhancedStrictConstraintScheduler:
                 
                 if self._add_validated_assignment_strict(assignment, class_size, state):
                     students_assigned += class_size
-                    state['unassigned_students'][req_key] = students_needed - students_assigned
-                    print(f"    Class added: {class_size} students, Coach {assignment['coach_name']}")
+                    state.unassigned_students[req_key] = students_needed - students_assigned
+                    logger.debug("    Class added: %s students, Coach %s", class_size, assignment['coach_name'])
                 else:
-                    print(f"    Failed to add assignment (strict limits enforced)")
+                    logger.debug("    Failed to add assignment (strict limits enforced)")
             
             if students_assigned > 0:
                 coverage_rate = (students_assigned / students_needed * 100)
-                print(f"    Coverage: {students_assigned}/{students_needed} ({coverage_rate:.1f}%)")
+                logger.debug("    Coverage: %s/%s (%.1f%%)", students_assigned, students_needed, coverage_rate)
             else:
-                print(f"    CONSTRAINT LIMITED: No students assigned for {branch} {level}")
-                state['critical_gaps'].append(req_key)
-        
-        total_scheduled = sum(a['actual_students'] for a in state['selected_assignments'])
-        coverage = (total_scheduled / self.total_students_required * 100)
-        print(f"  Phase 1 Complete: {coverage:.1f}% total coverage")
+                logger.debug("    CONSTRAINT LIMITED: No students assigned for %s %s", branch, level)
+                state.critical_gaps.append(req_key)
     
     def _phase2_enhanced_gap_filling(self, state, assignment_pool):
         """Phase 2: Fill remaining gaps with additional classes"""
-        print("Phase 2: Enhanced gap filling (strict workload limits)")
+        logger.debug("Phase 2: Enhanced gap filling (strict workload limits)")
         
-        gaps = [(k, v) for k, v in state['unassigned_students'].items() if v > 0]
+        gaps = [(k, v) for k, v in state.unassigned_students.items() if v > 0]
         if not gaps:
-            print("  No gaps to fill")
+            logger.debug("  No gaps to fill")
             return
         
         # Sort gaps by urgency (size and scarcity)
-        gaps.sort(key=lambda x: (x[1], self._calculate_scarcity_score(x[0])), reverse=True)
+        gaps.sort(key=lambda x: (x[1], self.scarcity_scores[x[0]]), reverse=True)
         
         for req_key, gap_size in gaps:
             branch, level = req_key
-            print(f"  Filling gap: {branch} {level} - {gap_size} students")
+            logger.debug("  Filling gap: %s %s - %s students", branch, level, gap_size)
             
             all_qualified = self._get_all_qualified_coaches(branch, level)
             students_filled = 0
@@ -558,32 +858,28 @@ class EnhancedStrictConstraintScheduler:
                     
                     if self._add_validated_assignment_strict(assignment, class_size, state):
                         students_filled += class_size
-                        state['unassigned_students'][req_key] -= class_size
-                        print(f"    Gap filled: {class_size} students, Coach {coach['name']}")
+                        state.unassigned_students[req_key] -= class_size
+                        logger.debug("    Gap filled: %s students, Coach %s", class_size, coach['name'])
             
             if students_filled == 0:
-                print(f"    CONSTRAINT LIMITED: Could not fill gap for {branch} {level}")
-        
-        total_scheduled = sum(a['actual_students'] for a in state['selected_assignments'])
-        coverage = (total_scheduled / self.total_students_required * 100)
-        print(f"  Phase 2 Complete: {coverage:.1f}% total coverage")
+                logger.debug("    CONSTRAINT LIMITED: Could not fill gap for %s %s", branch, level)
     
     def _phase3_enhanced_merging(self, state):
         """Phase 3: Merge students from different levels into existing classes"""
-        print("Phase 3: Enhanced merging")
+        logger.debug("Phase 3: Enhanced merging")
         
-        gaps = [(k, v) for k, v in state['unassigned_students'].items() if v > 0]
+        gaps = [(k, v) for k, v in state.unassigned_students.items() if v > 0]
         if not gaps:
-            print("  No gaps requiring merging")
+            logger.debug("  No gaps requiring merging")
             return
         
         for req_key, gap_size in gaps:
             branch, level = req_key
-            print(f"  Merging for {branch} {level}: {gap_size} students")
+            logger.debug("  Merging for %s %s: %s students", branch, level, gap_size)
             
             # Find compatible existing classes with available capacity
             compatible_classes = []
-            for assignment in state['selected_assignments']:
+            for assignment in state.selected_assignments:
                 if (assignment['branch'] == branch and 
                     self._check_level_compatibility(assignment['level'], level)):
                     
@@ -612,23 +908,19 @@ class EnhancedStrictConstraintScheduler:
                         assignment['actual_students'] += merge_size
                         students_merged += merge_size
                         self._update_merge_info(assignment, level)
-                        print(f"    Merged {merge_size}: {assignment['level']}+{level}")
+                        logger.debug("    Merged %s: %s+%s", merge_size, assignment['level'], level)
             
             if students_merged > 0:
-                state['unassigned_students'][req_key] -= students_merged
-                print(f"  Merge progress: {students_merged}/{gap_size} students merged")
-        
-        total_scheduled = sum(a['actual_students'] for a in state['selected_assignments'])
-        coverage = (total_scheduled / self.total_students_required * 100)
-        print(f"  Phase 3 Complete: {coverage:.1f}% total coverage")
+                state.unassigned_students[req_key] -= students_merged
+                logger.debug("  Merge progress: %s/%s students merged", students_merged, gap_size)
     
     def _phase4_multi_level_merging(self, state, assignment_pool):
         """Phase 4: Create new classes combining multiple levels"""
-        print("Phase 4: Multi-level merging")
+        logger.debug("Phase 4: Multi-level merging")
         
-        gaps = [(k, v) for k, v in state['unassigned_students'].items() if v > 0]
+        gaps = [(k, v) for k, v in state.unassigned_students.items() if v > 0]
         if not gaps:
-            print("  No gaps requiring multi-level merging")
+            logger.debug("  No gaps requiring multi-level merging")
             return
         
         # Group gaps by branch for efficient processing
@@ -638,7 +930,7 @@ class EnhancedStrictConstraintScheduler:
             branch_gaps[branch].append((level, gap_size))
         
         for branch, level_gaps in branch_gaps.items():
-            print(f"  Multi-level merging for branch {branch}")
+            logger.debug("  Multi-level merging for branch %s", branch)
             
             level_combinations = self._generate_level_combinations(level_gaps)
             
@@ -656,32 +948,30 @@ class EnhancedStrictConstraintScheduler:
                         class_size = min(total_students, max_capacity)
                         
                         if self._add_validated_assignment_strict(assignment, class_size, state):
+                            # Mark the class itself too, so later phases can tell it serves several requirements
+                            state.selected_assignments[-1]['merged_levels'] = levels
                             self._distribute_students_across_levels(levels, level_gaps, class_size, state)
                             assignment['merged_levels'] = levels
                             assignment['merged'] = 'Yes'
                             assignment['merged_with'] = '+'.join(sorted(levels))
                             
-                            print(f"    Multi-level class: {'+'.join(levels)} - {class_size} students")
+                            logger.debug("    Multi-level class: %s - %s students", '+'.join(levels), class_size)
                             break
-        
-        total_scheduled = sum(a['actual_students'] for a in state['selected_assignments'])
-        coverage = (total_scheduled / self.total_students_required * 100)
-        print(f"  Phase 4 Complete: {coverage:.1f}% total coverage")
     
     def _phase5_exhaustive_assignment(self, state, assignment_pool):
         """Phase 5: Use every available coach slot within strict limits"""
-        print("Phase 5: Exhaustive assignment (strict limits enforced)")
+        logger.debug("Phase 5: Exhaustive assignment (strict limits enforced)")
         
-        gaps = [(k, v) for k, v in state['unassigned_students'].items() if v > 0]
+        gaps = [(k, v) for k, v in state.unassigned_students.items() if v > 0]
         if not gaps:
-            print("  No gaps requiring exhaustive assignment")
+            logger.debug("  No gaps requiring exhaustive assignment")
             return
         
         for coach in self.full_time_coaches + self.part_time_coaches + self.branch_managers:
             coach_id = coach['id']
             
             for day in ['TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN']:
-                current_classes = state['coach_daily_classes'][coach_id][day]
+                current_classes = state.coach_daily_classes[coach_id][day]
                 max_classes = self.WEEKEND_DAILY_LIMIT if day in self.weekends else self.WEEKDAY_DAILY_LIMIT
                 
                 if current_classes < max_classes:
@@ -689,8 +979,7 @@ class EnhancedStrictConstraintScheduler:
                         branch, level = req_key
                         
                         if (gap_size > 0 and 
-                            level in coach['qualifications'] and 
-                            branch in coach['branches']):
+                            coach_id in self.qualified_coach_ids.get(req_key, ())):
                             
                             assignment = self._find_specific_coach_day_assignment_strict(
                                 coach_id, branch, level, day, state, assignment_pool
@@ -701,31 +990,27 @@ class EnhancedStrictConstraintScheduler:
                                 class_size = min(gap_size, max_capacity)
                                 
                                 if self._add_validated_assignment_strict(assignment, class_size, state):
-                                    state['unassigned_students'][req_key] -= class_size
-                                    print(f"    Exhaustive class: {class_size} students, Coach {coach['name']} on {day}")
+                                    state.unassigned_students[req_key] -= class_size
+                                    logger.debug("    Exhaustive class: %s students, Coach %s on %s", class_size, coach['name'], day)
                                     break
-        
-        total_scheduled = sum(a['actual_students'] for a in state['selected_assignments'])
-        coverage = (total_scheduled / self.total_students_required * 100)
-        print(f"  Phase 5 Complete: {coverage:.1f}% total coverage")
     
     def _phase6_maximum_utilization_strict(self, state, assignment_pool):
         """Phase 6: Final optimization to maximize utilization within strict limits"""
-        print("Phase 6: Maximum utilization (strict limits)")
+        logger.debug("Phase 6: Maximum utilization (strict limits)")
         
-        gaps = [(k, v) for k, v in state['unassigned_students'].items() if v > 0]
+        gaps = [(k, v) for k, v in state.unassigned_students.items() if v > 0]
         if not gaps:
-            print("  No gaps - maximum coverage achieved within strict limits")
+            logger.debug("  No gaps - maximum coverage achieved within strict limits")
             return
         
-        print(f"  Final optimization for {len(gaps)} remaining gaps")
+        logger.debug("  Final optimization for %s remaining gaps", len(gaps))
         
         # Final push: use every remaining slot within strict limits
         for coach in self.full_time_coaches + self.part_time_coaches + self.branch_managers:
             coach_id = coach['id']
             
             for day in ['TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN']:
-                current_classes = state['coach_daily_classes'][coach_id][day]
+                current_classes = state.coach_daily_classes[coach_id][day]
                 max_classes = self.WEEKEND_DAILY_LIMIT if day in self.weekends else self.WEEKDAY_DAILY_LIMIT
                 
                 while current_classes < max_classes:
@@ -737,8 +1022,7 @@ class EnhancedStrictConstraintScheduler:
                             
                         branch, level = req_key
                         
-                        if (level in coach['qualifications'] and 
-                            branch in coach['branches']):
+                        if coach_id in self.qualified_coach_ids.get(req_key, ()):
                             
                             assignment = self._find_specific_coach_day_assignment_strict(
                                 coach_id, branch, level, day, state, assignment_pool
@@ -749,37 +1033,131 @@ class EnhancedStrictConstraintScheduler:
                                 class_size = min(gap_size, max_capacity)
                                 
                                 if self._add_validated_assignment_strict(assignment, class_size, state):
-                                    state['unassigned_students'][req_key] -= class_size
+                                    state.unassigned_students[req_key] -= class_size
                                     current_classes += 1
                                     assignment_added = True
-                                    print(f"    Max utilization: {class_size} students, Coach {coach['name']} {day}")
+                                    logger.debug("    Max utilization: %s students, Coach %s %s", class_size, coach['name'], day)
                                     break
                     
                     if not assignment_added:
                         break
         
-        total_scheduled = sum(a['actual_students'] for a in state['selected_assignments'])
-        coverage = (total_scheduled / self.total_students_required * 100)
-        print(f"  Phase 6 Complete: {coverage:.1f}% total coverage")
-        
         # Final gap report
-        remaining_gaps = [(k, v) for k, v in state['unassigned_students'].items() if v > 0]
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+        remaining_gaps = [(k, v) for k, v in state.unassigned_students.items() if v > 0]
         if remaining_gaps:
             total_unassigned = sum(gap for _, gap in remaining_gaps)
-            print(f"  {total_unassigned} students remain unassigned due to strict workload limits")
+            logger.debug("  %s students remain unassigned due to strict workload limits", total_unassigned)
             for req_key, gap in remaining_gaps[:5]:
-                print(f"    CONSTRAINED: {req_key[0]} {req_key[1]} - {gap} students")
+                logger.debug("    CONSTRAINED: %s %s - %s students", req_key[0], req_key[1], gap)
         else:
-            print("  100% ASSIGNMENT ACHIEVED within strict workload limits")
+            logger.debug("  100% ASSIGNMENT ACHIEVED within strict workload limits")
+    
+    def _phase7_large_neighbourhood_search(self, state, assignment_pool, iteration):
+        """Phase 7: Repeatedly destroy one branch-day or one coach's week and repair it, keeping improvements"""
+        logger.debug("Phase 7: Large neighbourhood search")
+        
+        if self.LNS_MAX_MOVES <= 0:
+            return
+        
+        # Seeded per iteration so serial and parallel runs make the same moves
+        rng = random.Random(f"{self.RANDOM_SEED}-{iteration}") if self.RANDOM_SEED is not None else random.Random()
+        deadline = time.perf_counter() + self.LNS_TIME_BUDGET if self.LNS_TIME_BUDGET else None
+        
+        objective = self._schedule_objective(state)
+        moves = accepted = 0
+        stop_reason = 'max_moves'
+        
+        while moves < self.LNS_MAX_MOVES:
+            if deadline is not None and time.perf_counter() >= deadline:
+                stop_reason = 'time_budget'
+                break
+            if self._cancel_requested():
+                stop_reason = 'cancelled'
+                break
+            
+            removed = self._choose_neighbourhood(state, rng)
+            if not removed:
+                stop_reason = 'nothing_to_destroy'
+                break
+            
+            moves += 1
+            mark = state.snapshot()
+            unassigned_before = dict(state.unassigned_students)
+            
+            # Destroy: take the classes out and hand their students back to the gaps
+            for record in removed:
+                state.remove(record)
+                req_key = (record['branch'], record['level'])
+                state.unassigned_students[req_key] = state.unassigned_students.get(req_key, 0) + record['actual_students']
+            
+            self._repair_neighbourhood(state, assignment_pool, rng)
+            
+            candidate_objective = self._schedule_objective(state)
+            if candidate_objective > objective:
+                objective = candidate_objective
+                accepted += 1
+                logger.debug("  Move %s accepted: %s students in %s classes", moves, objective[0], -objective[1])
+            else:
+                state.rollback(mark)
+                state.unassigned_students = unassigned_before
+        
+        state.lns = {'moves': moves, 'accepted': accepted, 'stop_reason': stop_reason}
+    
+    def _schedule_objective(self, state):
+        """Students scheduled, then fewer classes, then total assignment score; higher tuples are better"""
+        records = state.selected_assignments
+        students = sum(record['actual_students'] for record in records)
+        score = sum(self.static_scores[record['id']] if record['id'] in self.static_scores else self._static_assignment_score(record)
+                    for record in records)
+        return students, -len(records), score
+    
+    def _choose_neighbourhood(self, state, rng):
+        """Classes of a random branch-day or a random coach's week, leaving multi-level classes alone"""
+        # Students of a multi-level class cannot be handed back to a single requirement
+        movable = [record for record in state.selected_assignments if len(record.get('merged_levels', ())) <= 1]
+        if not movable:
+            return []
+        
+        pivot = rng.choice(movable)
+        if rng.random() < 0.5:
+            return [record for record in movable if record['branch'] == pivot['branch'] and record['day'] == pivot['day']]
+        return [record for record in movable if record['coach_id'] == pivot['coach_id']]
+    
+    def _repair_neighbourhood(self, state, assignment_pool, rng):
+        """Refill gaps with the best valid classes, scarcest requirements first
+        
+        Every gap is tried, not just those of the destroyed classes: the coach time and
+        branch capacity they freed may serve another requirement better.
+        """
+        gaps = [req_key for req_key, gap in state.unassigned_students.items() if gap > 0]
+        rng.shuffle(gaps)
+        gaps.sort(key=lambda req_key: self.scarcity_scores.get(req_key, 0), reverse=True)
+        
+        for req_key in gaps:
+            branch, level = req_key
+            qualified_coaches = self._get_prioritized_coaches(branch, level)
+            max_capacity = self.class_capacities.get(level, 8)
+            
+            while state.unassigned_students[req_key] > 0:
+                assignment = self._find_optimal_assignment_strict(qualified_coaches, branch, level, state, assignment_pool)
+                if not assignment:
+                    break
+                
+                class_size = min(state.unassigned_students[req_key], max_capacity)
+                if not self._add_validated_assignment_strict(assignment, class_size, state):
+                    break
+                state.unassigned_students[req_key] -= class_size
     
     # ==================== ASSIGNMENT SCORING AND SELECTION ====================
     
-    def _score_assignment_enhanced(self, assignment, state):
-        """Score assignment based on configured preferences (1-10 scale)"""
+    def _static_assignment_score(self, assignment):
+        """Score terms that depend only on the assignment and configuration"""
         score = 0
         
         # Time preferences (using internal fixed values)
-        start_hour = int(assignment['start_time'].split(':')[0])
+        start_hour = assignment['start_minutes'] // 60
         if 10 <= start_hour <= 15:
             score += self._PEAK_HOURS_BONUS
         elif 9 <= start_hour <= 17:
@@ -791,12 +1169,22 @@ class EnhancedStrictConstraintScheduler:
         else:
             score += self.WEEKDAY_BIAS
         
+        # Capacity utilization (using fixed value)
+        score += assignment['capacity'] * self._CAPACITY_MULTIPLIER
+        
+        return score
+    
+    def _score_assignment_enhanced(self, assignment, state):
+        """Score assignment based on configured preferences (1-10 scale)"""
+        score = self.static_scores.get(assignment['id'])
+        if score is None:
+            score = self._static_assignment_score(assignment)
+        
         # Coach workload balance - only for full-time coaches (using 1-10 scale)
         coach_id = assignment['coach_id']
-        coach = self.coaches_data.get(coach_id)
         
-        if coach and coach['status'] == 'Full Time':
-            coach_load = state['coach_workload'][coach_id]
+        if coach_id in self.full_time_coach_ids:
+            coach_load = state.coach_workload[coach_id]
             if coach_load < 5:
                 score += self.UNDERUTILIZED_COACH_BONUS
         
@@ -809,34 +1197,47 @@ class EnhancedStrictConstraintScheduler:
             score -= self.SAME_PROGRAM_BACK_TO_BACK_PENALTY
         
         # Diverse class bonus (using 1-10 scale)
-        if coach_id in state['coach_levels_taught'] and assignment['level'] not in state['coach_levels_taught'][coach_id]:
+        if coach_id in state.coach_levels_taught and assignment['level'] not in state.coach_levels_taught[coach_id]:
             score += self.DIVERSE_CLASS_BONUS
         
-        # Capacity utilization (using fixed value)
-        score += assignment['capacity'] * self._CAPACITY_MULTIPLIER
-        
         return score
     
+    def _batch_scores(self, batch, state):
+        """_score_assignment_enhanced of every candidate in a batch"""
+        coach, day = batch.coach, batch.day
+        workload = state.coach_classes[coach]
+        starts = state.class_starts[coach, day]
+        ends = state.class_ends[coach, day]
+        
+        underutilized = self.full_time_codes[coach] & (workload < 5)
+        back_to_back = ((np.abs(batch.start_minutes[:, None] - ends) <= 5).any(axis=1) |
+                        (np.abs(starts - batch.end_minutes[:, None]) <= 5).any(axis=1))
+        same_program = batch.morning & (state.coach_day_branch[coach, day] == batch.branch) & (
+            (state.class_programs[coach, day] == batch.program) &
+            (np.abs(state.class_hours[coach, day] - (batch.start_minutes // 60)[:, None]) <= 1)).any(axis=1)
+        diverse = (workload > 0) & (state.coach_level_classes[coach, batch.level] == 0)
+        
+        # Terms in the same order as the scalar score, so the sums round the same way
+        scores = batch.static_score + np.where(underutilized, self.UNDERUTILIZED_COACH_BONUS, 0)
+        scores = scores + np.where(back_to_back, self.NO_TURNAROUND_BONUS, 0)
+        scores = scores - np.where(same_program, self.SAME_PROGRAM_BACK_TO_BACK_PENALTY, 0)
+        return scores + np.where(diverse, self.DIVERSE_CLASS_BONUS, 0)
+    
     def _is_back_to_back_with_existing(self, assignment, state):
         """Check if assignment is back-to-back with existing assignment"""
         coach_id = assignment['coach_id']
         day = assignment['day']
-        start_time = assignment['start_time']
-        end_time = assignment['end_time']
-        
-        start_dt = datetime.strptime(start_time, '%H:%M')
-        end_dt = datetime.strptime(end_time, '%H:%M')
+        start_minutes = assignment['start_minutes']
+        end_minutes = assignment['end_minutes']
         
         # Check if this class starts immediately after another class ends
-        for existing in state['coach_schedules'][coach_id][day]:
-            existing_end = datetime.strptime(existing['end_time'], '%H:%M')
-            if abs((start_dt - existing_end).total_seconds()) <= 5 * 60:  # Within 5 minutes
+        for existing in state.coach_schedules[coach_id][day]:
+            if abs(start_minutes - existing['end_minutes']) <= 5:  # Within 5 minutes
                 return True
         
         # Check if this class ends immediately before another class starts
-        for existing in state['coach_schedules'][coach_id][day]:
-            existing_start = datetime.strptime(existing['start_time'], '%H:%M')
-            if abs((existing_start - end_dt).total_seconds()) <= 5 * 60:  # Within 5 minutes
+        for existing in state.coach_schedules[coach_id][day]:
+            if abs(existing['start_minutes'] - end_minutes) <= 5:  # Within 5 minutes
                 return True
         
         return False
@@ -845,7 +1246,7 @@ class EnhancedStrictConstraintScheduler:
         """Check if this assignment would create same-program back-to-back on weekday mornings"""
         # Only apply to weekdays and morning hours
         day = assignment['day']
-        start_hour = int(assignment['start_time'].split(':')[0])
+        start_hour = assignment['start_minutes'] // 60
         
         if day not in self.weekdays or start_hour not in self.morning_hours:
             return False
@@ -856,7 +1257,7 @@ class EnhancedStrictConstraintScheduler:
         program = self.program_groups.get(level, level)
         
         # Check for existing same-program classes for this coach on this day and branch in the morning
-        existing_morning_classes = state['coach_program_morning_classes'][coach_id][day][branch]
+        existing_morning_classes = state.coach_program_morning_classes[coach_id][day][branch]
         
         for existing_class in existing_morning_classes:
             existing_program = existing_class['program']
@@ -876,7 +1277,7 @@ class EnhancedStrictConstraintScheduler:
             branch, level = req_key
             
             # Calculate raw scores (0-10 range)
-            scarcity_score = self._calculate_scarcity_score(req_key)
+            scarcity_score = self.scarcity_scores[req_key]
             complexity_score = self._calculate_level_complexity(level)
             size_priority = min(students / 20, 1.0) * 10  # Scale to 0-10
             
@@ -892,13 +1293,8 @@ class EnhancedStrictConstraintScheduler:
     
     def _calculate_scarcity_score(self, req_key):
         """Calculate resource scarcity for prioritization (0-10 scale)"""
-        branch, level = req_key
-        
-        qualified_coaches = len([c for c in self.full_time_coaches + self.part_time_coaches + self.branch_managers
-                               if level in c['qualifications'] and branch in c['branches']])
-        
-        available_slots = len([a for a in self.popular_assignments
-                             if a['branch'] == branch and a['level'] == level])
+        qualified_coaches = len(self.qualified_coach_ids.get(req_key, ()))
+        available_slots = self.popular_slot_counts[req_key]
         
         # Convert to 0-10 scale
         scarcity = min(10, (50 / max(1, qualified_coaches)) + (30 / max(1, available_slots)))
@@ -916,90 +1312,124 @@ class EnhancedStrictConstraintScheduler:
     # ==================== CONSTRAINT VALIDATION ====================
     
     def _validate_strict_workload_constraints(self, assignment, state):
-        """Validate all constraints with strict workload enforcement"""
+        """Validate all constraints with strict workload enforcement, counting rejections by reason"""
+        state.counters['validations'] += 1
+        
+        reason = self._constraint_violation(assignment, state)
+        if reason is None:
+            return True
+        
+        state.rejections[reason] += 1
+        return False
+    
+    def _constraint_violation(self, assignment, state):
+        """Name of the first constraint the assignment would break, or None if it fits"""
         coach_id = assignment['coach_id']
         coach = self.coaches_data[coach_id]
         day = assignment['day']
         period = assignment['period']
         branch = assignment['branch']
-        start_time = assignment['start_time']
-        end_time = assignment['end_time']
         duration = assignment['duration']
         
         # Basic availability check
         if not coach['availability'].get(day, {}).get(period, False):
-            return False
+            return 'availability'
         
         # Time conflict check
         if self._has_time_conflict(assignment, state):
-            return False
+            return 'time_conflict'
         
         # One branch per day constraint
-        existing_branch = state['coach_branch_daily'][coach_id][day]
+        existing_branch = state.coach_branch_daily[coach_id][day]
         if existing_branch and existing_branch != branch:
-            return False
+            return 'branch_per_day'
         
         # Strict daily class limits
-        current_classes = state['coach_daily_classes'][coach_id][day]
+        current_classes = state.coach_daily_classes[coach_id][day]
         strict_limit = self.WEEKEND_DAILY_LIMIT if day in self.weekends else self.WEEKDAY_DAILY_LIMIT
         
         if current_classes >= strict_limit:
-            return False
+            return 'daily_limit'
         
         # Daily hours limits
-        current_hours = state['coach_daily_hours'][coach_id][day]
+        current_hours = state.coach_daily_hours[coach_id][day]
         hours_limit = self.WEEKEND_DAILY_HOURS if day in self.weekends else self.WEEKDAY_DAILY_HOURS
         
         if current_hours + duration > hours_limit:
-            return False
+            return 'daily_hours'
         
         # Consecutive class limits
         if not self._respects_consecutive_limits(assignment, state):
-            return False
+            return 'consecutive_limit'
         
         # Branch capacity limits
         if not self._within_branch_capacity(assignment, state):
-            return False
+            return 'branch_capacity'
         
-        return True
+        return None
+    
+    def _batch_constraint_violations(self, batch, state):
+        """Position in _REJECTION_REASONS of the first constraint each candidate would break, -1 where it fits
+        
+        Same checks in the same order as _constraint_violation. The consecutive limit is
+        checked one candidate at a time, and only where the coach already has enough
+        classes that day to reach it.
+        """
+        coach, day = batch.coach, batch.day
+        day_classes = state.coach_day_classes[coach, day]
+        day_branch = state.coach_day_branch[coach, day]
+        
+        checks = (
+            ~batch.available,
+            (state.coach_day_masks[coach, day] & batch.slot_mask) != 0,
+            (day_branch >= 0) & (day_branch != batch.branch),
+            day_classes >= self.daily_class_limits[day],
+            state.coach_day_minutes[coach, day] + batch.duration > self.daily_minute_limits[day]
+        )
+        reasons = np.full(len(batch), -1, dtype=np.int8)
+        for reason, failed in enumerate(checks):
+            reasons[(reasons < 0) & failed] = reason
+        
+        consecutive_limit = len(checks)
+        for position in np.flatnonzero((reasons < 0) & (day_classes >= self.CONSECUTIVE_LIMIT)).tolist():
+            if not self._respects_consecutive_limits(batch.views[position], state):
+                reasons[position] = consecutive_limit
+        
+        branch_full = (state.branch_full_masks[batch.branch, day] & batch.slot_mask) != 0
+        reasons[(reasons < 0) & branch_full] = consecutive_limit + 1
+        return reasons
+    
+    def _count_batch_validations(self, reasons, state):
+        """Count validations and rejections as if each candidate had been validated on its own"""
+        state.counters['validations'] += len(reasons)
+        rejected = np.bincount(reasons[reasons >= 0], minlength=len(self._REJECTION_REASONS))
+        for reason, count in zip(self._REJECTION_REASONS, rejected.tolist()):
+            if count:
+                state.rejections[reason] += count
+    
+    def _slot_mask(self, assignment):
+        """Bitmask of the 30-minute slots covered by an assignment"""
+        return slot_mask(assignment['start_slot'], assignment['end_slot'])
     
     def _has_time_conflict(self, assignment, state):
         """Check for overlapping time assignments"""
-        coach_id = assignment['coach_id']
-        day = assignment['day']
-        start_time = assignment['start_time']
-        end_time = assignment['end_time']
-        
-        new_start = datetime.strptime(start_time, '%H:%M')
-        new_end = datetime.strptime(end_time, '%H:%M')
-        
-        for existing in state['coach_schedules'][coach_id][day]:
-            existing_start = datetime.strptime(existing['start_time'], '%H:%M')
-            existing_end = datetime.strptime(existing['end_time'], '%H:%M')
-            
-            if new_start < existing_end and existing_start < new_end:
-                return True
-        
-        return False
+        occupied = state.coach_slot_masks.get((assignment['coach_id'], assignment['day']), 0)
+        return bool(occupied & self._slot_mask(assignment))
     
     def _respects_consecutive_limits(self, assignment, state):
         """Check consecutive class limits with required breaks"""
         coach_id = assignment['coach_id']
         day = assignment['day']
-        start_time = assignment['start_time']
-        end_time = assignment['end_time']
         
-        day_assignments = state['coach_schedules'][coach_id][day].copy()
-        day_assignments.append({'start_time': start_time, 'end_time': end_time})
-        day_assignments.sort(key=lambda x: datetime.strptime(x['start_time'], '%H:%M'))
+        day_intervals = [(existing['start_minutes'], existing['end_minutes'])
+                         for existing in state.coach_schedules[coach_id][day]]
+        day_intervals.append((assignment['start_minutes'], assignment['end_minutes']))
+        day_intervals.sort(key=lambda x: x[0])
         
         consecutive_count = 1
         
-        for i in range(1, len(day_assignments)):
-            prev_end = datetime.strptime(day_assignments[i-1]['end_time'], '%H:%M')
-            curr_start = datetime.strptime(day_assignments[i]['start_time'], '%H:%M')
-            
-            gap_minutes = (curr_start - prev_end).total_seconds() / 60
+        for i in range(1, len(day_intervals)):
+            gap_minutes = day_intervals[i][0] - day_intervals[i-1][1]
             
             if gap_minutes < self.MIN_BREAK_MINUTES:
                 consecutive_count += 1
@@ -1012,27 +1442,8 @@ class EnhancedStrictConstraintScheduler:
     
     def _within_branch_capacity(self, assignment, state):
         """Check branch capacity constraints"""
-        branch = assignment['branch']
-        day = assignment['day']
-        start_time = assignment['start_time']
-        end_time = assignment['end_time']
-        
-        max_capacity = self.branch_limits.get(branch, 4)
-        
-        start_dt = datetime.strptime(start_time, '%H:%M')
-        end_dt = datetime.strptime(end_time, '%H:%M')
-        
-        current = start_dt
-        while current < end_dt:
-            slot_key = current.strftime('%H:%M')
-            current_usage = state['branch_time_usage'][branch][day][slot_key]
-            
-            if current_usage >= max_capacity:
-                return False
-            
-            current += timedelta(minutes=30)
-        
-        return True
+        full_slots = state.branch_full_slots.get((assignment['branch'], assignment['day']), 0)
+        return not (full_slots & self._slot_mask(assignment))
     
     # ==================== LEVEL MERGING AND COMPATIBILITY ====================
     
@@ -1086,24 +1497,41 @@ class EnhancedStrictConstraintScheduler:
                 assigned = int(total_class_size * proportion)
                 req_key = None
                 
-                for key in state['unassigned_students']:
+                for key in state.unassigned_students:
                     if key[1] == level:
                         req_key = key
                         break
                 
                 if req_key and assigned > 0:
-                    state['unassigned_students'][req_key] = max(0, state['unassigned_students'][req_key] - assigned)
+                    state.unassigned_students[req_key] = max(0, state.unassigned_students[req_key] - assigned)
     
     # ==================== COACH MANAGEMENT ====================
     
+    def _build_qualification_tables(self):
+        """Precompute qualified coaches and scarcity scores for every (branch, level)"""
+        self.qualified_coach_ids = defaultdict(set)
+        for coach in self.full_time_coaches + self.part_time_coaches + self.branch_managers:
+            for branch in coach['branches']:
+                for level in coach['qualifications']:
+                    self.qualified_coach_ids[(branch, level)].add(coach['id'])
+        self.qualified_coach_ids = dict(self.qualified_coach_ids)
+        
+        self.popular_slot_counts = Counter((a['branch'], a['level']) for a in self.popular_assignments)
+        self.scarcity_scores = {req_key: self._calculate_scarcity_score(req_key) for req_key in self.enrollment_dict}
+        
+        self._build_qualified_coach_lists()
+    
+    def _build_qualified_coach_lists(self):
+        """Order qualified coaches per (branch, level) by the current coach ordering"""
+        self.qualified_coaches = defaultdict(list)
+        for coach in self.full_time_coaches + self.part_time_coaches + self.branch_managers:
+            for req_key in {(branch, level) for branch in coach['branches'] for level in coach['qualifications']}:
+                self.qualified_coaches[req_key].append(coach)
+        self.qualified_coaches = dict(self.qualified_coaches)
+    
     def _get_prioritized_coaches(self, branch, level):
         """Get qualified coaches prioritized by type and availability"""
-        qualified = []
-        
-        for coach_list in [self.full_time_coaches, self.part_time_coaches, self.branch_managers]:
-            for coach in coach_list:
-                if level in coach['qualifications'] and branch in coach['branches']:
-                    qualified.append(coach)
+        qualified = list(self.qualified_coaches.get((branch, level), []))
         
         qualified.sort(key=lambda c: (
             c['status'] == 'Branch Manager',
@@ -1114,24 +1542,88 @@ class EnhancedStrictConstraintScheduler:
     
     def _get_all_qualified_coaches(self, branch, level):
         """Get all coaches qualified for specific branch and level"""
-        return [c for c in self.full_time_coaches + self.part_time_coaches + self.branch_managers
-                if level in c['qualifications'] and branch in c['branches']]
+        return list(self.qualified_coaches.get((branch, level), []))
     
     def _find_multi_qualified_coaches(self, branch, levels):
         """Find coaches qualified for multiple levels"""
-        qualified = []
-        
-        for coach in self.full_time_coaches + self.part_time_coaches + self.branch_managers:
-            if (branch in coach['branches'] and 
-                all(level in coach['qualifications'] for level in levels)):
-                qualified.append(coach)
-        
-        return qualified
+        common_ids = set.intersection(*(self.qualified_coach_ids.get((branch, level), set()) for level in levels))
+        return [c for c in self.qualified_coaches.get((branch, levels[0]), []) if c['id'] in common_ids]
     
     # ==================== ASSIGNMENT FINDING ====================
     
+    def _build_candidate_index(self):
+        """Index popular assignments by (branch, level), (coach, branch, level) and (coach, branch, level, day)"""
+        self.requirement_candidate_index = {}
+        self.candidate_index = {}
+        self.candidate_day_index = {}
+        
+        for assignment in self.popular_assignments:
+            key = (assignment['coach_id'], assignment['branch'], assignment['level'])
+            self.requirement_candidate_index.setdefault(key[1:], []).append(assignment)
+            self.candidate_index.setdefault(key, []).append(assignment)
+            self.candidate_day_index.setdefault(key + (assignment['day'],), []).append(assignment)
+        
+        # Batches are built from the lists on first use, so they follow the same order
+        self.candidate_batches = {}
+    
+    def _build_batch_tables(self):
+        """Per-code limits and coach flags read by the batch constraint checks and scoring"""
+        store = self.feasible_assignments
+        
+        weekend_days = np.array([day in self.weekends for day in store.days], dtype=bool)
+        self.daily_class_limits = np.where(weekend_days, self.WEEKEND_DAILY_LIMIT, self.WEEKDAY_DAILY_LIMIT)
+        self.daily_minute_limits = np.where(weekend_days, self.WEEKEND_DAILY_HOURS, self.WEEKDAY_DAILY_HOURS)
+        self.weekday_codes = np.array([day in self.weekdays for day in store.days], dtype=bool)
+        
+        self.coach_codes = {coach_id: code for code, coach_id in enumerate(store.coach_ids)}
+        self.full_time_codes = np.array([coach_id in self.full_time_coach_ids for coach_id in store.coach_ids], dtype=bool)
+        self.coach_availability = np.zeros((len(store.coach_ids), len(store.days), len(store.periods)), dtype=bool)
+        for coach_code, coach_id in enumerate(store.coach_ids):
+            availability = self.coaches_data[coach_id]['availability']
+            for day_code, day in enumerate(store.days):
+                for period_code, period in enumerate(store.periods):
+                    self.coach_availability[coach_code, day_code, period_code] = availability.get(day, {}).get(period, False)
+        
+        self.level_codes = {level: code for code, level in enumerate(store.levels)}
+        programs = {}
+        self.level_programs = np.array([programs.setdefault(self.program_groups.get(level, level), len(programs))
+                                        for level in store.levels], dtype=np.int16)
+    
+    def _candidate_batch(self, key, candidates, branch, level):
+        """Batch of an index list with its state-independent arrays, cached until the next shuffle"""
+        batch = self.candidate_batches.get(key)
+        if batch is not None:
+            return batch
+        
+        batch = CandidateBatch(self.feasible_assignments, candidates)
+        batch.branch = self.branch_index[branch]
+        batch.level = self.level_codes[level]
+        batch.program = self.level_programs[batch.level]
+        batch.available = self.coach_availability[batch.coach, batch.day, batch.period]
+        batch.static_score = np.array([self.static_scores[candidate_id] for candidate_id in batch.ids.tolist()], dtype=float)
+        batch.morning = self.weekday_codes[batch.day] & np.isin(batch.start_minutes // 60, self.morning_hours)
+        
+        self.candidate_batches[key] = batch
+        return batch
+    
+    def _get_candidates(self, assignment_pool, coach_id, branch, level, day=None):
+        """Get candidate assignments in pool order, using the index for the popular pool"""
+        if assignment_pool is self.popular_assignments:
+            if day is None:
+                return self.candidate_index.get((coach_id, branch, level), [])
+            return self.candidate_day_index.get((coach_id, branch, level, day), [])
+        
+        return [a for a in assignment_pool
+                if (a['coach_id'] == coach_id and 
+                    a['branch'] == branch and 
+                    a['level'] == level and
+                    (day is None or a['day'] == day))]
+    
     def _find_optimal_assignment_strict(self, qualified_coaches, branch, level, state, assignment_pool):
         """Find best assignment with strict constraint validation"""
+        if assignment_pool is self.popular_assignments:
+            return self._find_optimal_assignment_batch(qualified_coaches, branch, level, state)
+        
         best_assignment = None
         best_score = -1
         
@@ -1140,13 +1632,12 @@ class EnhancedStrictConstraintScheduler:
             
             # Check weekly workload limits
             weekly_limit = self._get_coach_weekly_limit(coach)
-            if state['coach_workload'][coach_id] >= weekly_limit:
+            if state.coach_workload[coach_id] >= weekly_limit:
+                state.counters['coaches_at_weekly_limit'] += 1
                 continue
             
-            candidates = [a for a in assignment_pool
-                         if (a['coach_id'] == coach_id and 
-                             a['branch'] == branch and 
-                             a['level'] == level)]
+            candidates = self._get_candidates(assignment_pool, coach_id, branch, level)
+            state.counters['candidates_examined'] += len(candidates)
             
             for assignment in candidates:
                 if self._validate_strict_workload_constraints(assignment, state):
@@ -1159,12 +1650,13 @@ class EnhancedStrictConstraintScheduler:
     
     def _find_specific_coach_assignment_strict(self, coach_id, branch, level, state, assignment_pool):
         """Find assignment for specific coach with constraint validation"""
-        candidates = [a for a in assignment_pool
-                     if (a['coach_id'] == coach_id and 
-                         a['branch'] == branch and 
-                         a['level'] == level)]
+        if assignment_pool is self.popular_assignments:
+            key = (coach_id, branch, level)
+            return self._first_valid_in_batch(key, self.candidate_index.get(key), branch, level, state, by_score=True)
         
-        candidates.sort(key=lambda a: self._score_assignment_enhanced(a, state), reverse=True)
+        candidates = sorted(self._get_candidates(assignment_pool, coach_id, branch, level),
+                            key=lambda a: self._score_assignment_enhanced(a, state), reverse=True)
+        state.counters['candidates_examined'] += len(candidates)
         
         for assignment in candidates:
             if self._validate_strict_workload_constraints(assignment, state):
@@ -1174,11 +1666,12 @@ class EnhancedStrictConstraintScheduler:
     
     def _find_specific_coach_day_assignment_strict(self, coach_id, branch, level, day, state, assignment_pool):
         """Find assignment for specific coach on specific day"""
-        candidates = [a for a in assignment_pool
-                     if (a['coach_id'] == coach_id and 
-                         a['branch'] == branch and 
-                         a['level'] == level and
-                         a['day'] == day)]
+        if assignment_pool is self.popular_assignments:
+            key = (coach_id, branch, level, day)
+            return self._first_valid_in_batch(key, self.candidate_day_index.get(key), branch, level, state)
+        
+        candidates = self._get_candidates(assignment_pool, coach_id, branch, level, day)
+        state.counters['candidates_examined'] += len(candidates)
         
         for assignment in candidates:
             if self._validate_strict_workload_constraints(assignment, state):
@@ -1186,6 +1679,63 @@ class EnhancedStrictConstraintScheduler:
         
         return None
     
+    def _find_optimal_assignment_batch(self, qualified_coaches, branch, level, state):
+        """_find_optimal_assignment_strict over the indexed pool, checking all coaches' candidates at once"""
+        # Search order of the coaches; those at their weekly limit are skipped
+        coach_ranks = {}
+        for coach in qualified_coaches:
+            if state.coach_workload[coach['id']] >= self._get_coach_weekly_limit(coach):
+                state.counters['coaches_at_weekly_limit'] += 1
+            else:
+                coach_ranks[self.coach_codes[coach['id']]] = len(coach_ranks)
+        
+        candidates = self.requirement_candidate_index.get((branch, level))
+        if not candidates or not coach_ranks:
+            return None
+        
+        batch = self._candidate_batch((branch, level), candidates, branch, level)
+        ranks = np.full(len(self.coach_codes), -1)
+        ranks[list(coach_ranks)] = list(coach_ranks.values())
+        candidate_ranks = ranks[batch.coach]
+        searched = candidate_ranks >= 0
+        
+        reasons = self._batch_constraint_violations(batch, state)
+        state.counters['candidates_examined'] += int(np.count_nonzero(searched))
+        self._count_batch_validations(reasons[searched], state)
+        
+        valid = np.flatnonzero(searched & (reasons < 0))
+        if len(valid) == 0:
+            return None
+        
+        scores = self._batch_scores(batch, state)[valid]
+        best_score = scores.max()
+        if best_score <= -1:
+            return None
+        
+        # Ties go to the earlier coach, then to the earlier candidate, as in the one-by-one search
+        tied = valid[scores == best_score]
+        return batch.views[tied[np.argmin(candidate_ranks[tied])]]
+    
+    def _first_valid_in_batch(self, key, candidates, branch, level, state, by_score=False):
+        """First candidate of an index list that passes validation, in pool order or best score first"""
+        if not candidates:
+            return None
+        
+        batch = self._candidate_batch(key, candidates, branch, level)
+        state.counters['candidates_examined'] += len(batch)
+        reasons = self._batch_constraint_violations(batch, state)
+        
+        # A stable sort keeps pool order among equal scores, like sorted(..., reverse=True)
+        order = np.argsort(-self._batch_scores(batch, state), kind='stable') if by_score else np.arange(len(batch))
+        ordered_reasons = reasons[order]
+        valid = np.flatnonzero(ordered_reasons < 0)
+        
+        # Validation stops at the first valid candidate
+        checked = valid[0] + 1 if len(valid) else len(batch)
+        self._count_batch_validations(ordered_reasons[:checked], state)
+        
+        return batch.views[order[valid[0]]] if len(valid) else None
+    
     # ==================== ASSIGNMENT CREATION ====================
     
     def _add_validated_assignment_strict(self, assignment, students, state):
@@ -1207,6 +1757,10 @@ class EnhancedStrictConstraintScheduler:
             'day': assignment['day'],
             'start_time': assignment['start_time'],
             'end_time': assignment['end_time'],
+            'start_minutes': assignment['start_minutes'],
+            'end_minutes': assignment['end_minutes'],
+            'start_slot': assignment['start_slot'],
+            'end_slot': assignment['end_slot'],
             'duration': assignment['duration'],
             'period': assignment['period'],
             'is_popular': assignment.get('is_popular', False),
@@ -1214,57 +1768,23 @@ class EnhancedStrictConstraintScheduler:
             'actual_students': students
         }
         
-        state['selected_assignments'].append(assignment_record)
-        
-        # Update state tracking
-        coach_id = assignment['coach_id']
-        day = assignment['day']
-        branch = assignment['branch']
-        level = assignment['level']
-        
-        state['coach_schedules'][coach_id][day].append(assignment_record)
-        state['coach_daily_hours'][coach_id][day] += assignment['duration']
-        state['coach_daily_classes'][coach_id][day] += 1
-        state['coach_branch_daily'][coach_id][day] = branch
-        state['coach_workload'][coach_id] += 1
-        
-        # Track diverse class levels taught
-        if coach_id not in state['coach_levels_taught']:
-            state['coach_levels_taught'][coach_id] = set()
-        state['coach_levels_taught'][coach_id].add(level)
-        
-        # Track morning program classes for same-program back-to-back detection
-        start_hour = int(assignment['start_time'].split(':')[0])
-        if day in self.weekdays and start_hour in self.morning_hours:
-            program = self.program_groups.get(level, level)
-            state['coach_program_morning_classes'][coach_id][day][branch].append({
-                'program': program,
-                'level': level,
-                'hour': start_hour,
-                'time': assignment['start_time']
-            })
-        
-        # Update branch time usage
-        start_dt = datetime.strptime(assignment['start_time'], '%H:%M')
-        end_dt = datetime.strptime(assignment['end_time'], '%H:%M')
-        
-        current = start_dt
-        while current < end_dt:
-            slot_key = current.strftime('%H:%M')
-            state['branch_time_usage'][branch][day][slot_key] += 1
-            current += timedelta(minutes=30)
-        
+        state.apply(assignment_record)
         return True
     
     # ==================== UTILITY FUNCTIONS ====================
     
     def _enhanced_adaptive_shuffle(self):
         """Shuffle assignments for better exploration"""
-        print("  Enhanced adaptive shuffling...")
-        random.shuffle(self.popular_assignments)
-        random.shuffle(self.full_time_coaches)
-        random.shuffle(self.part_time_coaches)
-        random.shuffle(self.branch_managers)
+        logger.debug("  Enhanced adaptive shuffling...")
+        self._rng.shuffle(self.popular_assignments)
+        self._rng.shuffle(self.full_time_coaches)
+        self._rng.shuffle(self.part_time_coaches)
+        self._rng.shuffle(self.branch_managers)
+        self._shuffles_applied += 1
+        
+        # Candidate and qualified coach lists follow the shuffled order, so rebuild them
+        self._build_candidate_index()
+        self._build_qualified_coach_lists()
     
     def _count_workload_violations(self, result):
         """Count workload constraint violations"""
@@ -1282,7 +1802,7 @@ class EnhancedStrictConstraintScheduler:
                 
                 if count > limit:
                     violations += 1
-                    print(f"  WORKLOAD VIOLATION: Coach {coach_id} has {count} classes on {day} (limit: {limit})")
+                    logger.debug("  WORKLOAD VIOLATION: Coach %s has %s classes on %s (limit: %s)", coach_id, count, day, limit)
         
         return violations
     
@@ -1322,14 +1842,12 @@ class EnhancedStrictConstraintScheduler:
         for coach_id, day_assignments in coach_day_assignments.items():
             for day, assignments in day_assignments.items():
                 if len(assignments) > 1:
-                    assignments.sort(key=lambda x: datetime.strptime(x['Start Time'], '%H:%M'))
+                    intervals = sorted(((time_to_minutes(a['Start Time']), time_to_minutes(a['End Time']))
+                                        for a in assignments), key=lambda x: x[0])
                     
                     consecutive_count = 1
-                    for i in range(1, len(assignments)):
-                        prev_end = datetime.strptime(assignments[i-1]['End Time'], '%H:%M')
-                        curr_start = datetime.strptime(assignments[i]['Start Time'], '%H:%M')
-                        
-                        gap_minutes = (curr_start - prev_end).total_seconds() / 60
+                    for i in range(1, len(intervals)):
+                        gap_minutes = intervals[i][0] - intervals[i-1][1]
                         
                         if gap_minutes < self.MIN_BREAK_MINUTES:
                             consecutive_count += 1
@@ -1360,7 +1878,7 @@ class EnhancedStrictConstraintScheduler:
     def _build_and_validate_result(self, state):
         """Build final schedule and calculate statistics"""
         schedule = []
-        for assignment in state['selected_assignments']:
+        for assignment in state.selected_assignments:
             entry = {
                 'Branch': assignment['branch'],
                 'Day': assignment['day'],
@@ -1429,7 +1947,7 @@ class EnhancedStrictConstraintScheduler:
     
     def _create_best_effort_strict_result(self):
         """Create fallback result with strict constraint enforcement"""
-        print("Creating best effort result with strict workload limits...")
+        logger.info("Creating best effort result with strict workload limits...")
         
         state = self._initialize_enhanced_state()
         
@@ -1444,11 +1962,29 @@ class EnhancedStrictConstraintScheduler:
                     capacity = self.class_capacities.get(level, 8)
                     class_size = min(students, capacity)
                     if self._add_validated_assignment_strict(assignment, class_size, state):
-                        state['unassigned_students'][req_key] = students - class_size
+                        state.unassigned_students[req_key] = students - class_size
         
         return self._build_and_validate_result(state)
 
 
+# Per-process schedulers used by parallel iteration workers
+_worker_schedulers = {}  # Search id -> scheduler, for the searches this worker process last served
+_WORKER_SEARCHES_KEPT = 2    # Concurrent jobs share the workers
+
+def _run_iteration_in_worker(search, iteration, shuffle_count):
+    """Run a single iteration in a worker process with the ordering it would have serially"""
+    search_id, payload, stop_event = search
+    scheduler = _worker_schedulers.get(search_id)
+    if scheduler is None:
+        data, config = pickle.loads(payload)
+        scheduler = _worker_schedulers[search_id] = EnhancedStrictConstraintScheduler(data, config, cancel_event=stop_event)
+        while len(_worker_schedulers) > _WORKER_SEARCHES_KEPT:
+            del _worker_schedulers[next(iter(_worker_schedulers))]
+    
+    scheduler._replay_shuffles(shuffle_count)
+    return scheduler._run_iteration(iteration)
+
+
 def execute_enhanced_strict_constraint_scheduling(data):
     """Execute the enhanced scheduling algorithm"""
     scheduler = EnhancedStrictConstraintScheduler(data)
@@ -162,6 +162,26 @@ class AlgorithmConfig(FlaskForm):
                                           validators=[DataRequired(), NumberRange(min=1)], 
                                           default=20,
                                           description="Maximum attempts to assign classes (higher = more persistent attempts)")
+    
+    time_limit_seconds = IntegerField("Time Limit (s)", 
+                                      validators=[Optional(), NumberRange(min=0)], 
+                                      default=0,
+                                      description="Stop searching after this many seconds and keep the best result so far (0 = no limit)")
+    
+    patience = IntegerField("Patience", 
+                            validators=[Optional(), NumberRange(min=0)], 
+                            default=0,
+                            description="Stop after this many iterations without a better result (0 = disabled)")
+    
+    lns_max_moves = IntegerField("Refinement Moves", 
+                                 validators=[Optional(), NumberRange(min=0)], 
+                                 default=20,
+                                 description="Times each iteration's timetable is partly cleared and refilled, keeping improvements (0 = disabled)")
+    
+    lns_time_budget = FloatField("Refinement Time Limit (s)", 
+                                 validators=[Optional(), NumberRange(min=0)], 
+                                 default=1.0,
+                                 description="Maximum seconds spent refining each iteration's timetable (0 = no limit)")
 
     # Scoring Weights (1-10 scale)
     weekend_bias = IntegerField("Weekend Priority", 
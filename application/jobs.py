@@ -0,0 +1,166 @@
+import logging
+import multiprocessing
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+class Job:
+    """A background run tracked by the job manager"""
+
+    def __init__(self, job_id):
+        self.id = job_id
+        self.status = 'queued'
+        self.progress = {}
+        self.result = None
+        self.best = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.events = []  # (sequence, type, data), sequences start at 1
+        self._events_changed = threading.Condition()
+        self.cancel_event = threading.Event()
+
+    def update_progress(self, **values):
+        """Merge new progress values; readers always see a complete dict"""
+        self.progress = {**self.progress, **values}
+
+    def cancel(self):
+        """Ask the job to stop; a running job decides what to keep"""
+        self.cancel_event.set()
+
+    def publish(self, event_type, **data):
+        """Record an event and wake up anyone waiting for it"""
+        with self._events_changed:
+            self.events.append((len(self.events) + 1, event_type, data))
+            self._events_changed.notify_all()
+
+    def wait_for_events(self, after, timeout=None):
+        """Events with a sequence above `after`, waiting up to `timeout` seconds for one"""
+        with self._events_changed:
+            self._events_changed.wait_for(lambda: len(self.events) > after, timeout)
+            return self.events[after:]
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'status': self.status,
+            'progress': self.progress,
+            'error': self.error,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+class WorkerPool:
+    """
+    Worker processes shared by the jobs' CPU-bound work, started on first use and then reused
+
+    Workers are spawned rather than forked: the pool is used from job threads, and forking
+    a process that runs other threads can deadlock the child. A pool broken by a worker
+    dying is replaced on the next submit().
+    """
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self._context = multiprocessing.get_context('spawn')
+        self._executor = None
+        self._manager = None
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.max_workers, mp_context=self._context)
+            try:
+                return self._executor.submit(func, *args)
+            except BrokenProcessPool:
+                logger.warning("Worker pool broken, starting a new one")
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = ProcessPoolExecutor(self.max_workers, mp_context=self._context)
+                return self._executor.submit(func, *args)
+
+    def event(self):
+        """An event that can be passed to and checked by the workers"""
+        with self._lock:
+            if self._manager is None:
+                self._manager = self._context.Manager()
+            return self._manager.Event()
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True, cancel_futures=True)
+                self._executor = None
+            if self._manager is not None:
+                self._manager.shutdown()
+                self._manager = None
+
+class JobManager:
+    """
+    Runs jobs on a local thread pool and keeps their state in process memory
+
+    submit() and get() are the whole interface used by the routes, so this can be
+    replaced by a manager backed by a broker without touching them. Jobs that need
+    processes share worker_pool instead of starting their own.
+    """
+    MAX_WORKERS = 2                # Jobs run concurrently, the rest wait in the queue
+    MAX_FINISHED_JOBS = 50         # Finished jobs kept for polling before being discarded
+    MAX_PROCESS_WORKERS = os.cpu_count() or 1  # Worker processes shared by all jobs
+
+    def __init__(self, max_workers=None, max_process_workers=None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or self.MAX_WORKERS,
+                                            thread_name_prefix='scheduler-job')
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self.worker_pool = WorkerPool(max_process_workers or self.MAX_PROCESS_WORKERS)
+
+    def submit(self, func, *args, **kwargs):
+        """Queue func(job, *args, **kwargs); its return value becomes the job result"""
+        job = Job(uuid.uuid4().hex)
+
+        with self._lock:
+            self._jobs[job.id] = job
+            self._discard_old_jobs()
+
+        self._executor.submit(self._run, job, func, args, kwargs)
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, func, args, kwargs):
+        if job.cancel_event.is_set():
+            job.status = 'cancelled'
+            job.finished_at = time.time()
+            job.publish('done', status=job.status, error=job.error)
+            return
+
+        job.status = 'running'
+        job.started_at = time.time()
+
+        try:
+            job.result = func(job, *args, **kwargs)
+            job.status = 'finished'
+        except Exception as e:
+            logger.exception("Job %s failed", job.id)
+            job.error = str(e)
+            job.status = 'failed'
+        finally:
+            job.finished_at = time.time()
+            job.publish('done', status=job.status, error=job.error)
+
+    def _discard_old_jobs(self):
+        finished = [job for job in self._jobs.values() if job.finished_at is not None]
+        finished.sort(key=lambda job: job.finished_at)
+
+        for job in finished[:max(0, len(finished) - self.MAX_FINISHED_JOBS)]:
+            del self._jobs[job.id]
+
+job_manager = JobManager()
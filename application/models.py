@@ -111,6 +111,18 @@ class CoachPreference(db.Model):
     coach = db.relationship('Coach', back_populates='preferred_levels')
     level = db.relationship('Level', back_populates='preferred_by_coaches')
 
+# =============================================================
+# ======================== Data Version =======================
+# =============================================================
+
+# Single row counter bumped on every write to scheduling input data,
+# so processes can tell whether a cached data package is stale
+class DataVersion(db.Model):
+    __tablename__ = 'data_version'
+
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
 # =============================================================
 # ==================== Generated Timetable ====================
 # =============================================================
@@ -121,6 +133,24 @@ class Timetable(db.Model):
     date_created = db.Column(db.DateTime, nullable=False, default=datetime.now)
 
     entries = db.relationship('TimetableEntry', back_populates='timetable', cascade='all, delete-orphan')
+    summary = db.relationship('TimetableSummary', back_populates='timetable', uselist=False, cascade='all, delete-orphan')
+
+    # Keyset pagination walks timetables newest first
+    __table_args__ = (
+        db.Index('ix_timetable_date_created_id', 'date_created', 'id'),
+    )
+
+# Headline numbers of a timetable, stored when it is saved. Timetables saved
+# before summaries existed get theirs the first time they are listed
+class TimetableSummary(db.Model):
+    __tablename__ = 'timetable_summary'
+
+    timetable_id = db.Column(db.Integer, db.ForeignKey('timetable.id'), primary_key=True)
+    class_count = db.Column(db.Integer, nullable=False)
+    coach_count = db.Column(db.Integer, nullable=False)
+    branch_class_counts = db.Column(db.JSON, nullable=False)  # Branch abbreviation -> number of classes
+
+    timetable = db.relationship('Timetable', back_populates='summary')
     
 
 class TimetableEntry(db.Model):
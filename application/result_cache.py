@@ -0,0 +1,105 @@
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+class ResultCache:
+    """
+    Scheduler results on disk, keyed by data fingerprint and result-relevant config
+
+    Entries are JSON files named <data version>-<key>.json. Reading an entry marks
+    it as recently used; once the directory grows past max_bytes the least recently
+    used entries are evicted, and entries from other data versions are removed.
+    """
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, directory, max_bytes=None):
+        self.directory = directory
+        self.max_bytes = max_bytes or self.DEFAULT_MAX_BYTES
+        os.makedirs(self.directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(fingerprint, config):
+        """Cache key for a data fingerprint and a normalised scheduler config"""
+        payload = json.dumps({'data': fingerprint, 'config': config}, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, key, data_version):
+        path = self._path(key, data_version)
+        try:
+            with open(path) as f:
+                result = json.load(f)
+        except FileNotFoundError:
+            return None
+        except ValueError:
+            # Unreadable entry, e.g. from an interrupted write on another platform
+            self._remove(path)
+            return None
+
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return result
+
+    def put(self, key, data_version, result):
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(result, f, default=_json_default)
+            os.replace(temp_path, self._path(key, data_version))
+        except Exception:
+            self._remove(temp_path)
+            raise
+
+        self._evict(data_version)
+
+    def _path(self, key, data_version):
+        return os.path.join(self.directory, f"{data_version}-{key}.json")
+
+    def _evict(self, data_version):
+        """Drop entries of other data versions, then least recently used ones over the size limit"""
+        entries = []
+        total_bytes = 0
+
+        for name in os.listdir(self.directory):
+            if not name.endswith('.json'):
+                continue
+
+            path = os.path.join(self.directory, name)
+            if not name.startswith(f"{data_version}-"):
+                self._remove(path)
+                continue
+
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total_bytes += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            self._remove(path)
+            total_bytes -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def result_cache_for(app):
+    """Result cache configured by RESULT_CACHE_DIR / RESULT_CACHE_MAX_BYTES, in the instance folder by default"""
+    directory = app.config.get('RESULT_CACHE_DIR') or os.path.join(app.instance_path, 'result_cache')
+    return ResultCache(directory, app.config.get('RESULT_CACHE_MAX_BYTES'))
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
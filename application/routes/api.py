@@ -1,18 +1,23 @@
-from flask import Blueprint, render_template, request, flash, redirect, jsonify, get_flashed_messages, url_for, send_file, current_app
+from flask import Blueprint, Response, render_template, request, flash, redirect, jsonify, get_flashed_messages, url_for, send_file, current_app
 from werkzeug.utils import secure_filename
+from sqlalchemy import insert, func, or_, and_
 from application import db, bcrypt
 from application.models import User
 from flask_login import login_user, logout_user, login_required
 from flask_wtf.csrf import CSRFProtect
 from application.forms import CoachFilter, CoachDetails, DataUploadForm, BranchFilter, BranchForm
 from application.models import DayOfWeek, User, Coach, Level, Branch, CoachBranch, CoachOffday, CoachPreference, Enrollment, PopularTimeslot, \
-                            Timetable, TimetableEntry
+                            Timetable, TimetableEntry, TimetableSummary
 
-from application.data_processor import load_database_driven
+from application.data_processor import load_database_driven, bump_data_version, get_data_version
 from application.enhanced_scheduler import EnhancedStrictConstraintScheduler, execute_enhanced_strict_constraint_scheduling
 from application.util import transform_schedule_for_timetable_js, generate_sample_timetable
+from application.jobs import job_manager
+from application.result_cache import result_cache_for
 
-from collections import defaultdict
+import json
+import logging
+from collections import defaultdict, Counter
 from datetime import datetime
 import pandas as pd
 from math import ceil
@@ -24,6 +29,30 @@ from openpyxl.utils import get_column_letter
 
 api_bp = Blueprint('apis', __name__, url_prefix='/api')
 
+logger = logging.getLogger(__name__)
+
+def not_modified(etag):
+    """Empty 304 response if the client already holds this version, else None; check it before querying"""
+    if etag not in request.if_none_match:
+        return None
+    return with_etag(Response(status=304), etag)
+
+def with_etag(response, etag):
+    """Tag a response so clients may keep it, revalidating before each use"""
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def timetable_etag(timetable):
+    # Saved entries never change, but the active flag does, SQLite may reuse the id of a deleted timetable,
+    # and entries are formatted with the current coach, branch and level names
+    return (f"timetable-{timetable.id}-{timetable.date_created.isoformat()}-"
+            f"{'active' if timetable.active else 'inactive'}-data-{get_data_version()}")
+
+def data_etag():
+    # Every write to coaches, branches and the other scheduling data bumps the version
+    return f"data-{get_data_version()}"
+
 @api_bp.route("/export-excel", methods=["POST"])
 def export_excel():
     data = request.get_json() or {}
@@ -332,6 +361,7 @@ def update_coach_by_id(id):
             cd = CoachOffday(coach_id=id, day=DayOfWeek[day.upper()].value, am=int(am == 'AM'))
             db.session.add(cd)
 
+    bump_data_version()
     db.session.commit()
     
     return get_coach_by_id(id), 200
@@ -341,6 +371,7 @@ def delete_coach_by_id(id):
     coach = Coach.query.get_or_404(id)
 
     db.session.delete(coach)
+    bump_data_version()
     db.session.commit()
     
     return '', 204
@@ -349,6 +380,11 @@ def delete_coach_by_id(id):
 def get_branch():
     """Get all branches"""
     try:
+        etag = data_etag()
+        cached = not_modified(etag)
+        if cached:
+            return cached
+
         branches = Branch.query.all()
         branches_data = []
         
@@ -366,10 +402,10 @@ def get_branch():
             })
         
         print(f"Returning {len(branches_data)} branches")
-        return jsonify({
+        return with_etag(jsonify({
             'success': True,
             'branches': branches_data
-        })
+        }), etag)
     except Exception as e:
         print(f"Error getting branches: {e}")
         return jsonify({
@@ -441,6 +477,7 @@ def create_branch():
         )
         
         db.session.add(new_branch)
+        bump_data_version()
         db.session.commit()
         
         return jsonify({
@@ -518,6 +555,7 @@ def update_branch(branch_id):
             # Print branch data before commit
             print(f"Updated branch data - ID: {branch.id}, Name: {branch.name}, Abbrv: {branch.abbrv}, Max Classes: {branch.max_classes}")
             
+            bump_data_version()
             db.session.commit()
             
             return jsonify({
@@ -566,6 +604,7 @@ def delete_branch(branch_id):
         
         branch_name = branch.name
         db.session.delete(branch)
+        bump_data_version()
         db.session.commit()
         
         return jsonify({
@@ -587,73 +626,269 @@ def delete_branch(branch_id):
 
 @api_bp.route('/timetable/generate/', methods=['POST'])
 def generate():
-    """Generate timetable data for frontend visualization using the database"""
+    """Queue a timetable generation job; poll its status and fetch the result when finished"""
     try:
-        print("Starting timetable generation...")
+        config = EnhancedStrictConstraintScheduler.coerce_config(request.get_json() or {})
+    except ValueError as e:
+        return jsonify({'success': False, 'message': str(e)}), 400
+    logger.debug("Generation config: %s", config)
+    
+    job = job_manager.submit(run_generation_job, current_app._get_current_object(), config)
+    logger.info("Queued timetable generation job %s", job.id)
+    
+    response = jsonify({
+        'success': True,
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': url_for('apis.get_generation_job', job_id=job.id),
+        'events_url': url_for('apis.stream_generation_job_events', job_id=job.id),
+        'best_url': url_for('apis.get_generation_job_best', job_id=job.id),
+        'cancel_url': url_for('apis.cancel_generation_job', job_id=job.id),
+        'result_url': url_for('apis.get_generation_job_result', job_id=job.id)
+    })
+    response.headers['Location'] = url_for('apis.get_generation_job', job_id=job.id)
+    return response, 202
 
-        config = request.get_json() or {}
-        print(config)
+def run_generation_job(job, app, config):
+    """Generate timetable data for frontend visualization using the database"""
+    with app.app_context():
+        logger.info("Starting timetable generation job %s", job.id)
         
         # Step 1: Load data from database using data_processor
-        print("Loading data from database...")
+        logger.debug("Loading data from database...")
+        job.update_progress(stage='loading')
+        data_version = get_data_version()
         data = load_database_driven()
         
         if not data:
-            print("Failed to load data from database")
-            return jsonify({
-                'success': False,
-                'message': 'Failed to load data from database',
-                'error': 'Database data unavailable or incomplete'
-            }), 500
+            raise RuntimeError('Failed to load data from database')
             
         # Log the loaded data stats
         coaches_count = len(data.get('coaches_data', {}))
         enrollment_count = len(data.get('enrollment_dict', {}))
         assignment_count = len(data.get('feasible_assignments', []))
         
-        print(f"Data loaded: {coaches_count} coaches, {enrollment_count} enrollments, {assignment_count} feasible assignments")
+        logger.info("Data loaded: %s coaches, %s enrollments, %s feasible assignments", coaches_count, enrollment_count, assignment_count)
         
         if coaches_count == 0 or enrollment_count == 0 or assignment_count == 0:
-            print("Insufficient data for scheduling")
-            return jsonify({
-                'success': False,
-                'message': 'Insufficient data for scheduling'
-            }), 400
+            raise RuntimeError('Insufficient data for scheduling')
         
-        # Step 2: Run the scheduling algorithm from enhanced_scheduler
-        print("Running enhanced strict constraint scheduling...")
-        scheduler = EnhancedStrictConstraintScheduler(data, config)
-        results = scheduler.schedule_with_complete_coverage()
-        # results = execute_enhanced_strict_constraint_scheduling(data)
+        # Step 2: Reuse the result of an identical earlier run, or run the scheduling algorithm
+        result_cache = result_cache_for(app)
+        cache_key = result_cache.make_key(data['fingerprint'], EnhancedStrictConstraintScheduler.result_config(config))
+        results = result_cache.get(cache_key, data_version)
         
-        if not results or 'schedule' not in results or not results['schedule']:
-            print("Scheduler failed to generate a timetable")
-            return jsonify({
-                'success': False,
-                'message': 'Scheduler failed to generate a timetable'
-            }), 500 
+        if results:
+            logger.info("Using cached result of an identical generation run (job %s)", job.id)
+            job.update_progress(cached=True)
+        else:
+            logger.debug("Running enhanced strict constraint scheduling...")
+            job.update_progress(stage='scheduling', cached=False)
+            scheduler = EnhancedStrictConstraintScheduler(data, config,
+                                                          progress_callback=lambda event: relay_scheduler_event(job, event),
+                                                          cancel_event=job.cancel_event,
+                                                          worker_pool=job_manager.worker_pool)
+            results = scheduler.schedule_with_complete_coverage()
+            
+            # Runs cut short by the clock or the user are not reproducible
+            statistics = results['statistics'] if results else {}
+            cut_short = (statistics.get('search', {}).get('stop_reason') in ('time_limit', 'cancelled') or
+                         statistics.get('lns', {}).get('stop_reason') == 'time_budget')
+            if results and results['schedule'] and not cut_short:
+                result_cache.put(cache_key, data_version, {
+                    'schedule': results['schedule'],
+                    'statistics': results['statistics']
+                })
         
+        if not results or 'schedule' not in results or not results['schedule']:
+            raise RuntimeError('Scheduler failed to generate a timetable')
         
         schedule_count = len(results['schedule'])
         coverage = results['statistics'].get('coverage_percentage', 0)
-        print(f"Schedule generated with {schedule_count} classes ({coverage:.1f}% coverage)")
-        
-        # Step 3: Convert the schedule to the format expected by timetable.js
-        processed_data = transform_schedule_for_timetable_js(results['schedule'])
-        
-        return jsonify(processed_data)
+        logger.info("Schedule generated with %s classes (%.1f%% coverage)", schedule_count, coverage)
         
-    except Exception as e:
-        import traceback
-        error_msg = f"Error generating timetable: {str(e)}"
-        print(f"{error_msg}")
-        traceback.print_exc()
+        search = results['statistics']['search']
+        job.update_progress(stage='finished', stop_reason=search['stop_reason'], iterations_run=search['iterations_run'])
         
-        print("Exception occurred - falling back to sample timetable")
+        # Step 3: Convert the schedule to the format expected by timetable.js
+        return {
+            'timetable': transform_schedule_for_timetable_js(results['schedule']),
+            'profile': results['statistics'].get('profile')
+        }
+
+def relay_scheduler_event(job, event):
+    """Publish a scheduler progress event on its job, keeping the best timetable so far"""
+    event_type = event.pop('type')
+    
+    if event_type == 'new_best':
+        # Only the latest best result is kept, and converted for timetable.js when first asked for
+        job.best = {
+            'iteration': event['iteration'],
+            'coverage': event['coverage'],
+            'result': event.pop('result')
+        }
+    elif event_type == 'iteration_complete':
+        job.update_progress(**event)
+    
+    job.publish(event_type, **event)
+
+def best_timetable(job):
+    """Best timetable found so far by a job, or None before its first valid iteration"""
+    best = job.best
+    if best is None:
+        return None
+    
+    if 'timetable' not in best:
+        best['timetable'] = transform_schedule_for_timetable_js(best['result']['schedule'])
+    
+    return {
+        'iteration': best['iteration'],
+        'coverage': best['coverage'],
+        'timetable': best['timetable']
+    }
+
+@api_bp.route('/timetable/jobs/<job_id>', methods=['GET'])
+def get_generation_job(job_id):
+    """Status and progress of a generation job"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({
+            'success': False,
+            'message': f"Job {job_id} not found"
+        }), 404
+    
+    return jsonify({
+        'success': True,
+        'job': job.to_dict()
+    })
+
+@api_bp.route('/timetable/jobs/<job_id>/events', methods=['GET'])
+def stream_generation_job_events(job_id):
+    """Server-Sent Events stream of a generation job's progress, ending with a 'done' event"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({
+            'success': False,
+            'message': f"Job {job_id} not found"
+        }), 404
+    
+    # Browsers resend the last seen id when reconnecting
+    last_seen = request.headers.get('Last-Event-ID', '0')
+    after = int(last_seen) if last_seen.isdigit() else 0
+    
+    def stream():
+        nonlocal after
+        while True:
+            events = job.wait_for_events(after, timeout=15)
+            if not events:
+                yield ": keep-alive\n\n"
+                continue
+            
+            # A late reader only needs the latest best timetable, sent once per batch
+            last_best = max((sequence for sequence, event_type, _ in events if event_type == 'new_best'), default=None)
+            
+            for sequence, event_type, data in events:
+                after = sequence
+                if event_type == 'new_best':
+                    if sequence != last_best:
+                        continue
+                    data = best_timetable(job)
+                yield f"id: {sequence}\nevent: {event_type}\ndata: {json.dumps(data)}\n\n"
+                
+                if event_type == 'done':
+                    return
+    
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@api_bp.route('/timetable/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_generation_job(job_id):
+    """Stop a generation job; it finishes with the best valid timetable found so far"""
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({
+            'success': False,
+            'message': f"Job {job_id} not found"
+        }), 404
+    
+    if job.finished_at is not None:
+        return jsonify({
+            'success': False,
+            'message': f"Job is already {job.status}"
+        }), 409
+    
+    job.cancel()
+    return jsonify({
+        'success': True,
+        'message': 'Cancellation requested',
+        'job': job.to_dict()
+    }), 202
+
+@api_bp.route('/timetable/jobs/<job_id>/best', methods=['GET'])
+def get_generation_job_best(job_id):
+    """Best valid timetable a generation job has found so far, while it is still running"""
+    job = job_manager.get(job_id)
+    if not job:
         return jsonify({
             'success': False,
-            'message': 'Something went wrong.'
+            'message': f"Job {job_id} not found"
+        }), 404
+    
+    best = best_timetable(job)
+    if best is None:
+        return jsonify({
+            'success': False,
+            'message': 'No valid timetable found yet',
+            'job': job.to_dict()
+        }), 404
+    
+    response = jsonify(best['timetable'])
+    response.headers['X-Search-Iteration'] = str(best['iteration'])
+    response.headers['X-Search-Coverage'] = f"{best['coverage']:.2f}"
+    return response
+
+@api_bp.route('/timetable/jobs/<job_id>/result', methods=['GET'])
+def get_generation_job_result(job_id):
+    """Timetable produced by a finished generation job
+    
+    With ?include=profile the timetable is wrapped as {'timetable': ..., 'profile': ...},
+    adding the scheduler's timings and constraint counters.
+    """
+    job = job_manager.get(job_id)
+    if not job:
+        return jsonify({
+            'success': False,
+            'message': f"Job {job_id} not found"
+        }), 404
+    
+    if job.status == 'failed':
+        return jsonify({
+            'success': False,
+            'message': job.error or 'Something went wrong.'
         }), 500
+    
+    if job.status == 'cancelled':
+        return jsonify({
+            'success': False,
+            'message': 'Job was cancelled before it started'
+        }), 409
+    
+    if job.status != 'finished':
+        return jsonify({
+            'success': False,
+            'message': f"Job is {job.status}",
+            'job': job.to_dict()
+        }), 202
+    
+    # The body is keyed by branch, so report how the search ended in headers
+    if 'profile' in request.args.getlist('include'):
+        response = jsonify(job.result)
+    else:
+        response = jsonify(job.result['timetable'])
+    response.headers['X-Search-Stop-Reason'] = job.progress['stop_reason']
+    response.headers['X-Search-Iterations'] = str(job.progress['iterations_run'])
+    response.headers['X-Result-Cache'] = 'hit' if job.progress.get('cached') else 'miss'
+    return response
 
 @api_bp.route('/timetable/save/', methods=['POST'])
 def save_timetable():
@@ -662,33 +897,62 @@ def save_timetable():
     if not timetable_data:
         return jsonify({'success': False, 'message': 'No data provided'}), 400
     
+    # Flatten the payload to (branch, day, coach, level, start time) by name
+    classes = [
+        (branch, day, coach, details['name'], datetime.strptime(details['start_time'], "%H%M").time())
+        for branch, branch_data in timetable_data.items()
+        for day, schedule in branch_data['schedule'].items()
+        for coach, coach_classes in schedule.items()
+        for details in coach_classes
+    ]
+
+    # Resolve every name with one query per table
+    branch_names = set(timetable_data)
+    coach_names = {coach for _, _, coach, _, _ in classes}
+    level_names = {level for _, _, _, level, _ in classes}
+    day_names = {day for _, day, _, _, _ in classes}
+
+    branch_ids = dict(db.session.query(Branch.abbrv, Branch.id).filter(Branch.abbrv.in_(branch_names)).all())
+    coach_ids = dict(db.session.query(Coach.name, Coach.id).filter(Coach.name.in_(coach_names)).all())
+    level_ids = dict(db.session.query(Level.alias, Level.id).filter(Level.alias.in_(level_names)).all())
+    day_values = {day: DayOfWeek[day[:3].upper()].value for day in day_names if day[:3].upper() in DayOfWeek.__members__}
+
+    unknown = {
+        'branches': sorted(branch_names - branch_ids.keys()),
+        'coaches': sorted(coach_names - coach_ids.keys()),
+        'levels': sorted(level_names - level_ids.keys()),
+        'days': sorted(day_names - day_values.keys())
+    }
+    unknown = {kind: names for kind, names in unknown.items() if names}
+    if unknown:
+        return jsonify({
+            'success': False,
+            'message': 'Timetable refers to unknown ' + ', '.join(f"{kind}: {', '.join(names)}" for kind, names in unknown.items()),
+            'unknown': unknown
+        }), 400
+
     timetable = Timetable()
     db.session.add(timetable)
     db.session.flush()  # Ensure it is generated before it is used
 
-    for branch, branch_data in timetable_data.items():
-        branch_id = Branch.query.filter(Branch.abbrv == branch).first().id
-
-        for day, schedule in branch_data['schedule'].items():
-            day_int = DayOfWeek[day[:3].upper()].value
-
-            for coach, classes in schedule.items():
-                coach_id = Coach.query.filter(Coach.name == coach).first().id
-
-                for details in classes:
-                    level = details['name']
-                    start_time = datetime.strptime(details['start_time'], "%H%M").time()
-                    level_id = Level.query.filter(Level.alias == level).first().id
-
-                    entry = TimetableEntry(
-                        timetable_id = timetable.id,
-                        branch_id=branch_id,
-                        coach_id=coach_id,
-                        level_id=level_id,
-                        start_time=start_time,
-                        day=day_int
-                    )
-                    db.session.add(entry)
+    # One executemany for all entries instead of an ORM object per class
+    entries = [{
+        'timetable_id': timetable.id,
+        'branch_id': branch_ids[branch],
+        'coach_id': coach_ids[coach],
+        'level_id': level_ids[level],
+        'start_time': start_time,
+        'day': day_values[day]
+    } for branch, day, coach, level, start_time in classes]
+    if entries:
+        db.session.execute(insert(TimetableEntry), entries)
+
+    db.session.add(TimetableSummary(
+        timetable_id=timetable.id,
+        class_count=len(entries),
+        coach_count=len({entry['coach_id'] for entry in entries}),
+        branch_class_counts=dict(Counter(branch for branch, _, _, _, _ in classes))
+    ))
         
     db.session.commit()
     return jsonify({
@@ -698,34 +962,49 @@ def save_timetable():
     }), 201
 
 
-def format_timetable(timetable):
+def load_timetable_entries(timetable_ids):
+    """Entry rows of the given timetables with branch, coach and level resolved, by timetable id, in one joined query
+
+    Rows come in unique_entry index order, the order timetable.entries used to load in.
+    """
+    rows = db.session.query(
+        TimetableEntry.timetable_id, Branch.abbrv, Coach.name, Level.alias, Level.duration,
+        TimetableEntry.start_time, TimetableEntry.day
+    ).join(Branch, TimetableEntry.branch_id == Branch.id) \
+        .join(Coach, TimetableEntry.coach_id == Coach.id) \
+        .join(Level, TimetableEntry.level_id == Level.id) \
+        .filter(TimetableEntry.timetable_id.in_(timetable_ids)) \
+        .order_by(TimetableEntry.timetable_id, TimetableEntry.coach_id, TimetableEntry.level_id,
+                  TimetableEntry.branch_id, TimetableEntry.start_time, TimetableEntry.day) \
+        .all()
+
+    entries = defaultdict(list)
+    for timetable_id, *entry in rows:
+        entries[timetable_id].append(entry)
+    return entries
+
+
+def format_timetable(timetable, entries):
     days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
     data = {}
+    branch_coaches = {}  # Branch -> set of its coach names, mirrors data[branch]["coaches"]
 
-    for entry in timetable.entries:
-        branch, coach, level = entry.branch, entry.coach, entry.level
-        start_time = entry.start_time.strftime("%H%M")
-        day = days[entry.day]
-
-        if branch.abbrv not in data:
-            data[branch.abbrv] = {
+    for branch, coach, level, duration, start_time, day in entries:
+        if branch not in data:
+            data[branch] = {
                 "coaches": [],
                 "schedule": {}
             }
+            branch_coaches[branch] = set()
 
-        if coach.name not in data[branch.abbrv]["coaches"]:
-            data[branch.abbrv]["coaches"].append(coach.name)
-
-        if day not in data[branch.abbrv]["schedule"]:
-            data[branch.abbrv]["schedule"][day] = {}
+        if coach not in branch_coaches[branch]:
+            branch_coaches[branch].add(coach)
+            data[branch]["coaches"].append(coach)
 
-        if coach.name not in data[branch.abbrv]["schedule"][day]:
-            data[branch.abbrv]["schedule"][day][coach.name] = []
-
-        data[branch.abbrv]["schedule"][day][coach.name].append({
-            "duration": level.duration,
-            "name": level.alias,
-            "start_time": start_time
+        data[branch]["schedule"].setdefault(days[day], {}).setdefault(coach, []).append({
+            "duration": duration,
+            "name": level,
+            "start_time": start_time.strftime("%H%M")
         })
 
     return {
@@ -736,8 +1015,108 @@ def format_timetable(timetable):
     }
 
 
+def summarize_timetables(timetable_ids):
+    """Summaries of timetables saved before summaries existed, by timetable id, added to the session"""
+    class_counts = defaultdict(dict)
+    for timetable_id, branch, count in db.session.query(TimetableEntry.timetable_id, Branch.abbrv, func.count()) \
+            .join(Branch, TimetableEntry.branch_id == Branch.id) \
+            .filter(TimetableEntry.timetable_id.in_(timetable_ids)) \
+            .group_by(TimetableEntry.timetable_id, Branch.abbrv):
+        class_counts[timetable_id][branch] = count
+
+    coach_counts = dict(db.session.query(TimetableEntry.timetable_id, func.count(TimetableEntry.coach_id.distinct()))
+                        .filter(TimetableEntry.timetable_id.in_(timetable_ids))
+                        .group_by(TimetableEntry.timetable_id)
+                        .all())
+
+    summaries = {timetable_id: TimetableSummary(
+        timetable_id=timetable_id,
+        class_count=sum(class_counts[timetable_id].values()),
+        coach_count=coach_counts.get(timetable_id, 0),
+        branch_class_counts=class_counts[timetable_id]
+    ) for timetable_id in timetable_ids}
+
+    db.session.add_all(summaries.values())
+    return summaries
+
+
+def format_timetable_summary(timetable, summary):
+    return {
+        'id': timetable.id,
+        'date_created': timetable.date_created.isoformat(),
+        'active': bool(timetable.active),
+        'class_count': summary.class_count,
+        'coach_count': summary.coach_count,
+        'branch_class_counts': summary.branch_class_counts
+    }
+
+
+def get_timetable_summaries():
+    """Summaries of saved timetables, newest first, one keyset page at a time"""
+    cursor = request.args.get('after')
+    show_active = bool(request.args.get('show_active', False))
+
+    # The cursor is the creation date and id of the last timetable of the previous page
+    try:
+        results_per_page = int(request.args.get('results', 20))
+        if results_per_page < 1:
+            raise ValueError(results_per_page)
+        if cursor:
+            created, last_id = cursor.rsplit('_', 1)
+            created, last_id = datetime.fromisoformat(created), int(last_id)
+    except ValueError:
+        return jsonify({
+            'success': False,
+            'message': f"Invalid page request (results={request.args.get('results')!r}, after={cursor!r}). "
+                       "Results must be a whole number of at least 1 and after a next_cursor value."
+        }), 400
+
+    # Large pages are capped rather than rejected
+    results_per_page = min(results_per_page, 100)
+
+    query = db.session.query(Timetable, TimetableSummary).outerjoin(TimetableSummary)
+
+    if cursor:
+        query = query.filter(or_(
+            Timetable.date_created < created,
+            and_(Timetable.date_created == created, Timetable.id < last_id)
+        ))
+
+    rows = query.order_by(Timetable.date_created.desc(), Timetable.id.desc()) \
+        .limit(results_per_page + 1) \
+        .all()
+
+    next_cursor = None
+    if len(rows) > results_per_page:
+        rows = rows[:results_per_page]
+        last = rows[-1][0]
+        next_cursor = f"{last.date_created.isoformat()}_{last.id}"
+
+    # The active timetable leads the first page wherever it falls in the history
+    if show_active and not cursor:
+        active = db.session.query(Timetable, TimetableSummary).outerjoin(TimetableSummary) \
+            .filter(Timetable.active == True).first()
+        if active and all(timetable.id != active[0].id for timetable, _ in rows):
+            rows.insert(0, active)
+
+    missing = [timetable.id for timetable, summary in rows if summary is None]
+    backfilled = summarize_timetables(missing) if missing else {}
+    results = [format_timetable_summary(timetable, summary or backfilled[timetable.id]) for timetable, summary in rows]
+    if backfilled:
+        db.session.commit()
+
+    return jsonify({
+        "results": results,
+        "next_cursor": next_cursor,
+        "total_count": Timetable.query.count()
+    }), 200
+
+
 @api_bp.route('/timetable/', methods=['GET'])
 def get_timetable():
+    if request.args.get('view') == 'summary':
+        return get_timetable_summaries()
+
     # results_per_page = int(request.args.get('results', 5))
     results_per_page = int(request.args.get('results', 100))  # TODO: Change back to 5 once pagination system is ready
     page = int(request.args.get('page', 1))
@@ -772,13 +1151,13 @@ def get_timetable():
         .limit(results_per_page) \
         .all()
     
-    days = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-    response = [format_timetable(t) for t in timetables]
-
     if show_active:
         active = Timetable.query.filter(Timetable.active==True).first()
-        if active and all(t['id'] != active.id for t in response):
-            response.insert(0, format_timetable(active))
+        if active and all(t.id != active.id for t in timetables):
+            timetables.insert(0, active)
+
+    entries = load_timetable_entries([t.id for t in timetables])
+    response = [format_timetable(t, entries[t.id]) for t in timetables]
 
     return jsonify({
         "results": response,
@@ -791,8 +1170,13 @@ def get_timetable():
 @api_bp.route('/timetable/<int:id>', methods=['GET'])
 def get_timetable_by_id(id):
     timetable = Timetable.query.get_or_404(id)
+
+    etag = timetable_etag(timetable)
+    cached = not_modified(etag)
+    if cached:
+        return cached
     
-    return jsonify(format_timetable(timetable)), 200
+    return with_etag(jsonify(format_timetable(timetable, load_timetable_entries([id])[id])), etag)
 
 @api_bp.route('/timetable/<int:id>', methods=['DELETE'])
 def delete_timetable(id):
@@ -830,12 +1214,22 @@ def get_active_timetable():
             'message': 'No active timetable found.'
         }), 404
 
-    return get_timetable_by_id(timetable.id)
+    etag = timetable_etag(timetable)
+    cached = not_modified(etag)
+    if cached:
+        return cached
+
+    return with_etag(jsonify(format_timetable(timetable, load_timetable_entries([timetable.id])[timetable.id])), etag)
 
 @api_bp.route('/coach/', methods=['GET'])
 def get_all_coaches():
     """Get all coaches in a format suitable for the timetable interface"""
     try:
+        etag = data_etag()
+        cached = not_modified(etag)
+        if cached:
+            return cached
+
         # Query all coaches from the database
         coaches = Coach.query.all()
         
@@ -852,10 +1246,10 @@ def get_all_coaches():
                 
             coach_list.append(coach_data)
         
-        return jsonify({
+        return with_etag(jsonify({
             'success': True,
             'coaches': coach_list
-        })
+        }), etag)
     except Exception as e:
         print(f"Error fetching coaches: {str(e)}")
         return jsonify({
@@ -0,0 +1,218 @@
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from application.time_utils import SLOTS_PER_DAY, slot_mask
+
+# Start and end of an empty entry in the per-coach-day class arrays, far from any real time
+NO_CLASS = -10000
+
+class SchedulerState:
+    """
+    Classes chosen so far in one scheduling pass, with the per-coach and per-branch
+    tallies the constraint checks read
+
+    Classes go in through apply() and come out through remove(). Both update every
+    tally incrementally and are journaled: undo() reverts the latest change and
+    rollback() returns to a mark taken with snapshot(), so a change can be tried
+    and taken back without rebuilding anything.
+
+    The coach tallies are mirrored in arrays indexed by the store's coach, day and
+    level codes, which the batch checks read for many candidates at once.
+
+    unassigned_students is bookkeeping of the phases and is not journaled.
+    """
+
+    def __init__(self, scheduler):
+        self.selected_assignments = []
+        self.coach_schedules = defaultdict(lambda: defaultdict(list))
+        self.coach_slot_masks = {}  # (coach_id, day) -> bitmask of occupied 30-minute slots
+        self.coach_daily_hours = defaultdict(lambda: defaultdict(int))
+        self.coach_daily_classes = defaultdict(lambda: defaultdict(int))
+        self.coach_branch_daily = defaultdict(lambda: defaultdict(str))
+        self.branch_usage = np.zeros((len(scheduler.branch_index), len(scheduler.day_index), SLOTS_PER_DAY), dtype=np.int16)
+        self.branch_full_slots = {}  # (branch, day) -> bitmask of slots at branch capacity
+        self.coach_workload = defaultdict(int)
+        self.coach_levels_taught = {}  # coach_id -> Counter of levels taught, for diversity
+        self.coach_program_morning_classes = defaultdict(lambda: defaultdict(lambda: defaultdict(list)))
+
+        store = scheduler.feasible_assignments
+        coaches, days = len(store.coach_ids), len(store.days)
+        self.coach_day_classes = np.zeros((coaches, days), dtype=np.int16)
+        self.coach_day_minutes = np.zeros((coaches, days), dtype=np.int32)
+        self.coach_day_masks = np.zeros((coaches, days), dtype=np.int64)
+        self.coach_day_branch = np.full((coaches, days), -1, dtype=np.int16)
+        self.coach_classes = np.zeros(coaches, dtype=np.int32)
+        self.coach_level_classes = np.zeros((coaches, len(store.levels)), dtype=np.int16)
+        self.branch_full_masks = np.zeros((len(scheduler.branch_index), len(scheduler.day_index)), dtype=np.int64)
+
+        # A coach-day's classes fill its first coach_day_classes entries, in no particular order.
+        # Programs are kept for weekday-morning classes only and are -1 otherwise
+        max_daily_classes = max(scheduler.WEEKDAY_DAILY_LIMIT, scheduler.WEEKEND_DAILY_LIMIT, 1)
+        self.class_starts = np.full((coaches, days, max_daily_classes), NO_CLASS, dtype=np.int32)
+        self.class_ends = np.full((coaches, days, max_daily_classes), NO_CLASS, dtype=np.int32)
+        self.class_programs = np.full((coaches, days, max_daily_classes), -1, dtype=np.int16)
+        self.class_hours = np.zeros((coaches, days, max_daily_classes), dtype=np.int16)
+
+        self.unassigned_students = dict(scheduler.enrollment_dict)
+        self.critical_gaps = []
+        self.counters = Counter()  # Work done: candidates examined, validations run, ...
+        self.rejections = Counter()  # Failed validations by violated constraint
+        self.lns = None  # Summary of the neighbourhood search phase, once it has run
+
+        self._scheduler = scheduler
+        self._journal = []
+
+    def apply(self, assignment):
+        """Add a validated class"""
+        coach_schedule = self.coach_schedules[assignment['coach_id']][assignment['day']]
+        self._insert(assignment, len(self.selected_assignments), len(coach_schedule))
+        self._journal.append(('apply', assignment))
+
+    def remove(self, assignment):
+        """Take a class out of the schedule, wherever it is"""
+        position, schedule_position = self._delete(assignment)
+        self._journal.append(('remove', assignment, position, schedule_position))
+
+    def undo(self):
+        """Revert the latest apply() or remove()"""
+        operation, assignment, *positions = self._journal.pop()
+        if operation == 'apply':
+            self._delete(assignment)
+        else:
+            self._insert(assignment, *positions)
+
+    def snapshot(self):
+        """Mark to rollback() to; taking one costs nothing"""
+        return len(self._journal)
+
+    def rollback(self, mark):
+        """Revert every change made since snapshot() returned mark"""
+        while len(self._journal) > mark:
+            self.undo()
+
+    def _insert(self, assignment, position, schedule_position):
+        coach_id = assignment['coach_id']
+        day = assignment['day']
+        branch = assignment['branch']
+        level = assignment['level']
+
+        self.selected_assignments.insert(position, assignment)
+        self.coach_schedules[coach_id][day].insert(schedule_position, assignment)
+        self.coach_slot_masks[(coach_id, day)] = self.coach_slot_masks.get((coach_id, day), 0) | slot_mask(assignment['start_slot'], assignment['end_slot'])
+        self.coach_daily_hours[coach_id][day] += assignment['duration']
+        self.coach_daily_classes[coach_id][day] += 1
+        self.coach_branch_daily[coach_id][day] = branch
+        self.coach_workload[coach_id] += 1
+        self.coach_levels_taught.setdefault(coach_id, Counter())[level] += 1
+
+        morning_class = self._morning_class(assignment)
+        if morning_class:
+            self.coach_program_morning_classes[coach_id][day][branch].append(morning_class)
+
+        coach, day_code, branch_code, level_code = self._codes(assignment)
+        entry = self.coach_day_classes[coach, day_code]
+        self.class_starts[coach, day_code, entry] = assignment['start_minutes']
+        self.class_ends[coach, day_code, entry] = assignment['end_minutes']
+        self.class_programs[coach, day_code, entry] = self._scheduler.level_programs[level_code] if morning_class else -1
+        self.class_hours[coach, day_code, entry] = assignment['start_minutes'] // 60
+
+        self.coach_day_classes[coach, day_code] += 1
+        self.coach_day_minutes[coach, day_code] += assignment['duration']
+        self.coach_day_masks[coach, day_code] |= slot_mask(assignment['start_slot'], assignment['end_slot'])
+        self.coach_day_branch[coach, day_code] = branch_code
+        self.coach_classes[coach] += 1
+        self.coach_level_classes[coach, level_code] += 1
+
+        self._update_branch_usage(assignment, 1)
+
+    def _delete(self, assignment):
+        coach_id = assignment['coach_id']
+        day = assignment['day']
+        branch = assignment['branch']
+        level = assignment['level']
+
+        position = _index_of(self.selected_assignments, assignment)
+        del self.selected_assignments[position]
+
+        coach_schedule = self.coach_schedules[coach_id][day]
+        schedule_position = _index_of(coach_schedule, assignment)
+        del coach_schedule[schedule_position]
+
+        # A coach's classes on a day never overlap, so their slot bits are disjoint
+        self.coach_slot_masks[(coach_id, day)] &= ~slot_mask(assignment['start_slot'], assignment['end_slot'])
+        self.coach_daily_hours[coach_id][day] -= assignment['duration']
+        self.coach_daily_classes[coach_id][day] -= 1
+        if not coach_schedule:
+            self.coach_branch_daily[coach_id][day] = ''
+        self.coach_workload[coach_id] -= 1
+
+        levels_taught = self.coach_levels_taught[coach_id]
+        levels_taught[level] -= 1
+        if not levels_taught[level]:
+            del levels_taught[level]
+        if not levels_taught:
+            del self.coach_levels_taught[coach_id]
+
+        morning_class = self._morning_class(assignment)
+        if morning_class:
+            self.coach_program_morning_classes[coach_id][day][branch].remove(morning_class)
+
+        # Move the coach-day's last entry into the freed one
+        coach, day_code, branch_code, level_code = self._codes(assignment)
+        last = self.coach_day_classes[coach, day_code] - 1
+        entry = np.flatnonzero(self.class_starts[coach, day_code, :last + 1] == assignment['start_minutes'])[0]
+        for classes in (self.class_starts, self.class_ends, self.class_programs, self.class_hours):
+            classes[coach, day_code, entry] = classes[coach, day_code, last]
+        self.class_starts[coach, day_code, last] = NO_CLASS
+        self.class_ends[coach, day_code, last] = NO_CLASS
+        self.class_programs[coach, day_code, last] = -1
+
+        self.coach_day_classes[coach, day_code] -= 1
+        self.coach_day_minutes[coach, day_code] -= assignment['duration']
+        self.coach_day_masks[coach, day_code] &= ~slot_mask(assignment['start_slot'], assignment['end_slot'])
+        if not coach_schedule:
+            self.coach_day_branch[coach, day_code] = -1
+        self.coach_classes[coach] -= 1
+        self.coach_level_classes[coach, level_code] -= 1
+
+        self._update_branch_usage(assignment, -1)
+
+        return position, schedule_position
+
+    def _codes(self, assignment):
+        """Store codes of the class's coach, day, branch and level"""
+        row = self._scheduler.feasible_assignments.rows[assignment['id']]
+        return int(row['coach']), int(row['day']), int(row['branch']), int(row['level'])
+
+    def _morning_class(self, assignment):
+        """Entry tracked for same-program back-to-back detection, or None outside weekday mornings"""
+        start_hour = assignment['start_minutes'] // 60
+        if assignment['day'] not in self._scheduler.weekdays or start_hour not in self._scheduler.morning_hours:
+            return None
+
+        level = assignment['level']
+        return {
+            'program': self._scheduler.program_groups.get(level, level),
+            'level': level,
+            'hour': start_hour,
+            'time': assignment['start_time']
+        }
+
+    def _update_branch_usage(self, assignment, change):
+        """Add change to the branch's slot usage and refresh the slots that are at capacity"""
+        branch = assignment['branch']
+        day = assignment['day']
+
+        branch_code = self._scheduler.branch_index[branch]
+        day_code = self._scheduler.day_index[day]
+        day_usage = self.branch_usage[branch_code, day_code]
+        day_usage[assignment['start_slot']:assignment['end_slot']] += change
+
+        full_slots = np.flatnonzero(day_usage >= self._scheduler.branch_limits.get(branch, 4))
+        self.branch_full_slots[(branch, day)] = sum(1 << int(slot) for slot in full_slots)
+        self.branch_full_masks[branch_code, day_code] = self.branch_full_slots[(branch, day)]
+
+def _index_of(items, item):
+    """Position of the very object in a list; classes with equal fields are still different classes"""
+    return next(i for i, candidate in enumerate(items) if candidate is item)
@@ -1397,9 +1397,62 @@ function addParameterDescriptions() {
     });
 }
 
+// Follow a generation job's progress events, rendering each new best timetable,
+// and resolve with the final timetable once the job finishes
+function waitForGenerationJob(job) {
+    return new Promise((resolve, reject) => {
+        const source = new EventSource(job.events_url);
+        
+        source.addEventListener('iteration_complete', e => {
+            const progress = JSON.parse(e.data);
+            const progressLabel = document.querySelector('#timetableDiv .ms-2');
+            if (progressLabel) {
+                progressLabel.textContent = `Generating timetable... iteration ${progress.iteration}/${progress.max_iterations}, best coverage ${progress.best_coverage.toFixed(1)}%`;
+            }
+        });
+        
+        source.addEventListener('new_best', e => {
+            const best = JSON.parse(e.data);
+            console.log(`Best so far: ${best.coverage.toFixed(1)}% coverage (iteration ${best.iteration})`);
+            
+            branchFilter = null;
+            data = best.timetable;
+            renderTimetable(data);
+        });
+        
+        source.addEventListener('done', async e => {
+            source.close();
+            const done = JSON.parse(e.data);
+            if (done.status !== 'finished') {
+                reject(new Error(done.error || 'Failed to generate timetable'));
+                return;
+            }
+            
+            try {
+                const response = await fetch(job.result_url);
+                const result = await response.json();
+                if (!response.ok) {
+                    throw new Error(`Server returned ${response.status}: ${response.statusText}, ${result.message}`);
+                }
+                resolve(result);
+            } catch (error) {
+                reject(error);
+            }
+        });
+        
+        // The browser reconnects on dropped connections; a closed source means the job is gone
+        source.onerror = () => {
+            if (source.readyState === EventSource.CLOSED) {
+                reject(new Error('Lost connection to the generation job'));
+            }
+        };
+    });
+}
+
 document.addEventListener('DOMContentLoaded', async () => {
     const timetableDiv = document.getElementById('timetableDiv');
     const generate_btn = document.getElementById('generateBtn');
+    const stop_btn = document.getElementById('stopBtn');
     const save_btn = document.getElementById('saveBtn');
     const deleteZone = document.getElementById('deleteZone');
 
@@ -1529,12 +1582,21 @@ document.addEventListener('DOMContentLoaded', async () => {
                 body: JSON.stringify(config)
             });
             
-            const result = await response.json();
+            const job = await response.json();
             if (!response.ok) {
                 console.log(response);
-                throw new Error(`Server returned ${response.status}: ${response.statusText}, ${result.message}`);
+                throw new Error(`Server returned ${response.status}: ${response.statusText}, ${job.message}`);
             }
             
+            // Stopping keeps the best timetable found so far as the final result
+            stop_btn.classList.remove('d-none');
+            stop_btn.onclick = () => fetch(job.cancel_url, { method: 'POST' });
+            
+            const result = await waitForGenerationJob(job).finally(() => {
+                stop_btn.classList.add('d-none');
+                stop_btn.onclick = null;
+            });
+            
             // Reset branch filter to make sure all branches are shown
             branchFilter = null;
             
@@ -14,20 +14,6 @@ function createCard(timetable) {
         hour12: true
     }).format(date);
 
-    const uniqueCoaches = new Set(
-        Object.values(timetable.data).flatMap(branch => branch.coaches || [])
-    );
-
-    const totalClasses = Object.values(timetable.data).reduce((count, branch) => {
-        const schedule = branch.schedule || {};
-        for (const day of Object.values(schedule)) {
-            for (const sessions of Object.values(day)) {
-            count += sessions.length;
-            }
-        }
-        return count;
-    }, 0);
-
     container.innerHTML = `
         <div id="timetableCard_${timetable.id}" class="card h-100" data-bs-toggle="modal" data-bs-target="#modal" data-id="${timetable.id}">
             <div class="card-body">
@@ -42,11 +28,11 @@ function createCard(timetable) {
                 </div>
                 <div class="mb-2">
                     <small class="fw-semibold">Number of Coaches:</small>
-                    ${uniqueCoaches.size}
+                    ${timetable.coach_count}
                 </div>
                 <div class="mb-2">
                     <small class="fw-semibold">Total Number of Classes:</small>
-                    ${totalClasses}
+                    ${timetable.class_count}
                 </div>
             </div>
         </div>
@@ -54,6 +40,49 @@ function createCard(timetable) {
     return container.firstElementChild;
 }
 
+function appendCards(timetables) {
+    const timetableList = document.getElementById('timetableList');
+
+    timetables.forEach(timetable => {
+        const div = document.createElement('div');
+        div.className = 'col-xl-3 col-lg-4 col-md-6 col-sm-12';
+        div.appendChild(createCard(timetable))
+
+        timetableList.appendChild(div);
+    });
+}
+
+function updateLoadMore(nextCursor) {
+    const timetableList = document.getElementById('timetableList');
+    document.getElementById('loadMore')?.remove();
+    if (!nextCursor) return;
+
+    const div = document.createElement('div');
+    div.id = 'loadMore';
+    div.className = 'col-12 text-center my-3';
+    div.innerHTML = `<button type="button" class="btn btn-outline-light">Load more</button>`;
+    div.querySelector('button').addEventListener('click', () => loadTimetables(nextCursor));
+
+    timetableList.after(div);
+}
+
+// Summaries only; a timetable's entries are fetched from /api/timetable/<id> when needed
+async function loadTimetables(cursor) {
+    const params = new URLSearchParams({ view: 'summary' });
+    if (cursor) params.set('after', cursor);
+
+    const response = await fetch(`/api/timetable/?${params}`, {
+        method: 'GET',
+        headers: { 'Content-Type': 'application/json' }
+    });
+
+    const timetables = await response.json();
+    timetableData.results.push(...timetables.results);
+    appendCards(timetables.results);
+    updateLoadMore(timetables.next_cursor);
+    return timetables;
+}
+
 async function updateTimeable() {
     const timetableList = document.getElementById('timetableList');
     const timetableCount = document.getElementById('timetableCount');
@@ -65,35 +94,20 @@ async function updateTimeable() {
             </div>
         </div>`;
 
-    // TODO add pagination to timetable API
-    const response = await fetch(`/api/timetable`, {
-        method: 'GET',
-        headers: { 'Content-Type': 'application/json' }
-    });
-
-    const timetables = await response.json();
-    timetableList.innerHTML = '';
+    timetableData = { results: [] };
+    const timetables = await loadTimetables();
+    document.getElementById('loader')?.remove();
 
     timetableCount.innerText = timetables.total_count;
-    if (timetables.length == 0) {
+    if (timetables.results.length == 0) {
         timetableList.innerHTML = `
             <div class="col-12 text-center py-5 text-muted">
                 <p class="text-white fs-5">No saved timetables yet...</p>
             </div>
         `;
-    } else {
-        console.log(timetables)
-        timetables.results.forEach(timetable => {
-            const div = document.createElement('div');
-            div.className = 'col-xl-3 col-lg-4 col-md-6 col-sm-12';
-            div.appendChild(createCard(timetable))
-
-            timetableList.appendChild(div);
-        });
     }
 
-    timetableData = timetables;
-    return timetables;
+    return timetableData;
 }
 
 function updateModal(e) {
@@ -0,0 +1,23 @@
+SLOT_MINUTES = 30  # Granularity of timeslots and branch capacity tracking
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+
+def time_to_minutes(time_str):
+    """Convert an 'HH:MM' string to minutes after midnight"""
+    hours, minutes = time_str.split(':')
+    return int(hours) * 60 + int(minutes)
+
+def minutes_to_time(minutes):
+    """Convert minutes after midnight to an 'HH:MM' string"""
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+def minutes_to_slot(minutes):
+    """Index of the 30-minute slot containing the given minute of the day"""
+    return minutes // SLOT_MINUTES
+
+def slot_span(start_minutes, end_minutes):
+    """Half-open range of 30-minute slot indices touched by a class"""
+    return minutes_to_slot(start_minutes), -(-end_minutes // SLOT_MINUTES)
+
+def slot_mask(start_slot, end_slot):
+    """Bitmask with the bits of the half-open slot range set"""
+    return ((1 << (end_slot - start_slot)) - 1) << start_slot
@@ -1,8 +1,12 @@
+import logging
 from flask import jsonify
 from application import db
+from application.data_processor import bump_data_version
 from application.models import DayOfWeek, User, Coach, Level, Branch, CoachBranch, CoachOffday, CoachPreference, Enrollment, PopularTimeslot
 import pandas as pd
 
+logger = logging.getLogger(__name__)
+
 def format_schedule_for_display(schedule):
     """Format schedule data for timetable.js display"""
     formatted_classes = []
@@ -58,7 +62,7 @@ def process_availability_file(file):
     try:
         df = pd.read_csv(file)
         df = df[df['available'] == False]
-        print(f"Loaded {len(df)} rows from availability CSV")
+        logger.debug("Loaded %s rows from availability CSV", len(df))
         
         if df.empty:
             raise ValueError("CSV file is empty")
@@ -71,7 +75,7 @@ def process_availability_file(file):
         
         with db.session.no_autoflush:
             deleted_count = db.session.query(CoachOffday).delete()
-            print(f"Deleted {deleted_count} existing availability records")
+            logger.debug("Deleted %s existing availability records", deleted_count)
             
             processed_count = 0
             for _, row in df.iterrows():
@@ -86,19 +90,20 @@ def process_availability_file(file):
                     db.session.add(coach_offday)
                     processed_count += 1
                 except Exception as e:
-                    print(f"Error processing row {processed_count + 1}: {e}")
+                    logger.warning("Error processing row %s: %s", processed_count + 1, e)
                     continue
         
+        bump_data_version()
         return f"Processed {processed_count} availability records"
     except Exception as e:
-        print(f"Error in process_availability_file: {e}")
+        logger.error("Error in process_availability_file: %s", e)
         raise
 
 def process_branch_config_file(file):
     """Process branch config CSV file"""
     try:
         df = pd.read_csv(file)
-        print(f"Loaded {len(df)} rows from branch config CSV")
+        logger.debug("Loaded %s rows from branch config CSV", len(df))
         
         if df.empty:
             raise ValueError("CSV file is empty")
@@ -112,7 +117,7 @@ def process_branch_config_file(file):
         with db.session.no_autoflush:
             # Clear existing branch config data
             deleted_count = db.session.query(Branch).delete()
-            print(f"Deleted {deleted_count} existing Branch records")
+            logger.debug("Deleted %s existing Branch records", deleted_count)
             
             processed_count = 0
             for _, row in df.iterrows():
@@ -124,19 +129,20 @@ def process_branch_config_file(file):
                     db.session.add(branch)
                     processed_count += 1
                 except Exception as e:
-                    print(f"Error processing row {processed_count + 1}: {e}")
+                    logger.warning("Error processing row %s: %s", processed_count + 1, e)
                     continue
         
+        bump_data_version()
         return f"Processed {processed_count} branch configurations"
     except Exception as e:
-        print(f"Error in process_branch_config_file: {e}")
+        logger.error("Error in process_branch_config_file: %s", e)
         raise
 
 def process_coaches_file(file):
     """Process coaches CSV file with direct level qualification columns"""
     try:
         df = pd.read_csv(file)
-        print(f"Loaded {len(df)} rows from coaches CSV")
+        logger.debug("Loaded %s rows from coaches CSV", len(df))
         
         if df.empty:
             raise ValueError("CSV file is empty")
@@ -184,7 +190,7 @@ def process_coaches_file(file):
                         existing_coach.status = str(row['status']).strip()    
                     else:
                         # Create new coach with all fields
-                        print(qualifications)
+                        logger.debug("New coach %s qualifications: %s", coach_id, qualifications)
                         coach = Coach(
                             id=coach_id,
                             name=str(row['coach_name']).strip(),
@@ -210,7 +216,7 @@ def process_coaches_file(file):
                                 coach_branch = CoachBranch(coach_id=coach_id, branch_id=branch.id)
                                 db.session.add(coach_branch)
                             else:
-                                print(f"Branch with code {branch_code} not found")
+                                logger.warning("Branch with code %s not found", branch_code)
                     
                     if existing_coach:
                         CoachPreference.query.filter_by(coach_id=coach_id).delete()
@@ -218,32 +224,28 @@ def process_coaches_file(file):
                     for col, value in qualifications.items():
                         if not value:
                             continue
-                        print(coach_id, col, value)
+                        logger.debug("Coach %s qualified for %s", coach_id, col)
                         level = Level.query.filter_by(alias=col).first()
-                        print(value)
                         if level:
                             preference = CoachPreference(coach_id=coach_id, level_id=level.id)
                             db.session.add(preference)
                     
                     processed_count += 1
                 except Exception as e:
-                    print(f"Error processing coach row {processed_count + 1}: {e}")
-                    import traceback
-                    traceback.print_exc()
+                    logger.exception("Error processing coach row %s: %s", processed_count + 1, e)
                     continue
         
+        bump_data_version()
         return f"Processed {processed_count} coach records with level qualifications"
     except Exception as e:
-        print(f"Error in process_coaches_file: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error in process_coaches_file: %s", e)
         raise
 
 def process_enrollment_file(file):
     """Process enrollment CSV file"""
     try:
         df = pd.read_csv(file)
-        print(f"Loaded {len(df)} rows from enrollment CSV")
+        logger.debug("Loaded %s rows from enrollment CSV", len(df))
         
         if df.empty:
             raise ValueError("CSV file is empty")
@@ -257,7 +259,7 @@ def process_enrollment_file(file):
         with db.session.no_autoflush:
             # Clear existing enrollment data
             deleted_count = db.session.query(Enrollment).delete()
-            print(f"Deleted {deleted_count} existing enrollment records")
+            logger.debug("Deleted %s existing enrollment records", deleted_count)
             
             processed_count = 0
             for _, row in df.iterrows():
@@ -270,19 +272,20 @@ def process_enrollment_file(file):
                     db.session.add(enrollment)
                     processed_count += 1
                 except Exception as e:
-                    print(f"Error processing row {processed_count + 1}: {e}")
+                    logger.warning("Error processing row %s: %s", processed_count + 1, e)
                     continue
         
+        bump_data_version()
         return f"Processed {processed_count} enrollment records"
     except Exception as e:
-        print(f"Error in process_enrollment_file: {e}")
+        logger.error("Error in process_enrollment_file: %s", e)
         raise
 
 def process_popular_timeslots_file(file):
     """Process popular timeslots CSV file"""
     try:
         df = pd.read_csv(file)
-        print(f"Loaded {len(df)} rows from popular timeslots CSV")
+        logger.debug("Loaded %s rows from popular timeslots CSV", len(df))
         
         if df.empty:
             raise ValueError("CSV file is empty")
@@ -296,7 +299,7 @@ def process_popular_timeslots_file(file):
         with db.session.no_autoflush:
             # Clear existing popular timeslots data
             deleted_count = db.session.query(PopularTimeslot).delete()
-            print(f"Deleted {deleted_count} existing popular timeslot records")
+            logger.debug("Deleted %s existing popular timeslot records", deleted_count)
             
             processed_count = 0
             for _, row in df.iterrows():
@@ -309,12 +312,13 @@ def process_popular_timeslots_file(file):
                     db.session.add(timeslot)
                     processed_count += 1
                 except Exception as e:
-                    print(f"Error processing row {processed_count + 1}: {e}")
+                    logger.warning("Error processing row %s: %s", processed_count + 1, e)
                     continue
         
+        bump_data_version()
         return f"Processed {processed_count} popular timeslot records"
     except Exception as e:
-        print(f"Error in process_popular_timeslots_file: {e}")
+        logger.error("Error in process_popular_timeslots_file: %s", e)
         raise
 
 def transform_schedule_for_timetable_js(schedule):
@@ -361,7 +365,7 @@ def transform_schedule_for_timetable_js(schedule):
         day = day_mapping.get(day_code, day_code)
         
         if not branch or not day or not coach_name:
-            print(f"Skipping entry with missing data: {entry}")
+            logger.warning("Skipping entry with missing data: %s", entry)
             skipped_count += 1
             continue
             
@@ -411,7 +415,7 @@ def transform_schedule_for_timetable_js(schedule):
             processed_count += 1
             
         except Exception as format_error:
-            print(f"Error formatting entry {entry}: {str(format_error)}")
+            logger.warning("Error formatting entry %s: %s", entry, format_error)
             skipped_count += 1
             continue
     
@@ -419,11 +423,17 @@ def transform_schedule_for_timetable_js(schedule):
     for branch in processed_data:
         processed_data[branch]['coaches'].sort()
     
-    print(f"Transformed {processed_count} schedule entries for timetable.js display")
+    logger.debug("Transformed %s schedule entries for timetable.js display", processed_count)
     if skipped_count > 0:
-        print(f"Skipped {skipped_count} entries due to missing or invalid data")
+        logger.warning("Skipped %s entries due to missing or invalid data", skipped_count)
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        _log_timetable_summary(processed_data)
     
-    # Print summary of the processed data
+    return processed_data
+
+def _log_timetable_summary(processed_data):
+    """Log class counts of transformed timetable data"""
     branch_count = len(processed_data)
     class_count = 0
     day_counts = {}
@@ -437,15 +447,13 @@ def transform_schedule_for_timetable_js(schedule):
                 class_count += len(processed_data[branch]['schedule'][day][coach])
                 day_counts[day] += len(processed_data[branch]['schedule'][day][coach])
     
-    print(f"Generated timetable with {branch_count} branches and {class_count} total classes")
+    logger.debug("Generated timetable with %s branches and %s total classes", branch_count, class_count)
     for day, count in sorted(day_counts.items()):
-        print(f"  - {day}: {count} classes")
-    
-    return processed_data
+        logger.debug("  - %s: %s classes", day, count)
 
 def generate_sample_timetable():
     """Generate a sample timetable when real data is insufficient"""
-    print("Generating sample timetable data for demonstration")
+    logger.debug("Generating sample timetable data for demonstration")
     
     # Create a sample timetable structure
     sample_data = {
@@ -518,5 +526,5 @@ def generate_sample_timetable():
         }
     }
     
-    print("Generated sample timetable with 2 branches and multiple classes")
+    logger.debug("Generated sample timetable with 2 branches and multiple classes")
     return jsonify(sample_data)
\ No newline at end of file
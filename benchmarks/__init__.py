@@ -0,0 +1 @@
+from benchmarks.synthetic import SCALES, generate_data, generate_records
@@ -0,0 +1,156 @@
+"""
+Scheduler benchmarks on synthetic data
+
+Record a baseline:
+    python -m benchmarks.run --scales small medium --output benchmarks/baseline.json
+
+Re-run the cases of a baseline and flag regressions (exit status 1 if any):
+    python -m benchmarks.run --compare benchmarks/baseline.json
+"""
+import argparse
+import json
+import logging
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from application.enhanced_scheduler import EnhancedStrictConstraintScheduler
+from benchmarks.synthetic import SCALES, generate_data
+
+# Allowed slowdown / memory growth before a case counts as a regression, as fractions of the baseline
+RUNTIME_TOLERANCE = 0.20
+MEMORY_TOLERANCE = 0.10
+COVERAGE_TOLERANCE = 0.01      # Percentage points
+
+def run_case(scale, seed, iterations, repeat=3):
+    """Schedule one synthetic dataset under a fixed seed and measure the run"""
+    num_branches, num_coaches = SCALES[scale]
+
+    processing_start = time.perf_counter()
+    data = generate_data(num_branches, num_coaches, seed=seed)
+    processing_seconds = time.perf_counter() - processing_start
+
+    config = {'max_iterations': iterations, 'random_seed': seed, 'parallel_workers': 1}
+
+    # Timed and traced separately, tracemalloc slows pure Python code down considerably.
+    # The fastest of a few runs is the least disturbed by whatever else the machine is doing
+    runtime_seconds, (scheduler, result) = min((_timed(_schedule, data, config, seed) for _ in range(repeat)),
+                                               key=lambda timed: timed[0])
+
+    tracemalloc.start()
+    try:
+        _schedule(data, config, seed)
+        _, peak_memory_bytes = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    statistics = result['statistics']
+    return {
+        'scale': scale,
+        'seed': seed,
+        'branches': num_branches,
+        'coaches': num_coaches,
+        'feasible_assignments': len(data['feasible_assignments']),
+        'processing_seconds': processing_seconds,
+        'runtime_seconds': runtime_seconds,
+        'peak_memory_bytes': peak_memory_bytes,
+        'coverage_percentage': statistics['coverage_percentage'],
+        'total_classes': statistics['total_classes'],
+        'violations': scheduler._count_violations(result),
+        'workload_violations': scheduler._count_workload_violations(result)
+    }
+
+def _schedule(data, config, seed):
+    random.seed(seed)
+    scheduler = EnhancedStrictConstraintScheduler(data, config)
+    return scheduler, scheduler.schedule_with_complete_coverage()
+
+def _timed(func, *args):
+    start = time.perf_counter()
+    value = func(*args)
+    return time.perf_counter() - start, value
+
+def run_benchmarks(scales, seeds, iterations, repeat):
+    cases = []
+    for scale in scales:
+        for seed in seeds:
+            case = run_case(scale, seed, iterations, repeat)
+            print(f"{scale:>7} seed {seed}: {case['runtime_seconds']:.2f}s, "
+                  f"{case['peak_memory_bytes'] / 2**20:.1f} MiB peak, "
+                  f"{case['coverage_percentage']:.1f}% coverage, "
+                  f"{case['violations'] + case['workload_violations']} violations")
+            cases.append(case)
+
+    return {
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'settings': {'scales': list(scales), 'seeds': list(seeds), 'iterations': iterations, 'repeat': repeat},
+        'cases': cases
+    }
+
+def find_regressions(baseline, current):
+    """Messages for each case that got slower, bigger, lost coverage or gained violations"""
+    regressions = []
+    previous_cases = {(case['scale'], case['seed']): case for case in baseline['cases']}
+
+    for case in current['cases']:
+        previous = previous_cases.get((case['scale'], case['seed']))
+        if previous is None:
+            continue
+
+        name = f"{case['scale']} seed {case['seed']}"
+        if case['runtime_seconds'] > previous['runtime_seconds'] * (1 + RUNTIME_TOLERANCE):
+            regressions.append(f"{name}: runtime {previous['runtime_seconds']:.2f}s -> {case['runtime_seconds']:.2f}s")
+        if case['peak_memory_bytes'] > previous['peak_memory_bytes'] * (1 + MEMORY_TOLERANCE):
+            regressions.append(f"{name}: peak memory {previous['peak_memory_bytes'] / 2**20:.1f} MiB -> "
+                               f"{case['peak_memory_bytes'] / 2**20:.1f} MiB")
+        if case['coverage_percentage'] < previous['coverage_percentage'] - COVERAGE_TOLERANCE:
+            regressions.append(f"{name}: coverage {previous['coverage_percentage']:.2f}% -> {case['coverage_percentage']:.2f}%")
+        for key in ('violations', 'workload_violations'):
+            if case[key] > previous[key]:
+                regressions.append(f"{name}: {key.replace('_', ' ')} {previous[key]} -> {case[key]}")
+
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the scheduler on synthetic data")
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=['small'])
+    parser.add_argument('--seeds', nargs='+', type=int, default=[0, 1, 2])
+    parser.add_argument('--iterations', type=int, default=10, help="Scheduler iterations per run")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per case, the fastest is kept")
+    parser.add_argument('--output', help="Write the results to this JSON file")
+    parser.add_argument('--compare', metavar='BASELINE', help="Re-run the cases of a baseline file and flag regressions")
+    args = parser.parse_args(argv)
+
+    # Data shortages are expected at random and would drown out the results
+    logging.getLogger('application').setLevel(logging.ERROR)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        settings = baseline['settings']
+        results = run_benchmarks(settings['scales'], settings['seeds'], settings['iterations'], settings['repeat'])
+    else:
+        baseline = None
+        results = run_benchmarks(args.scales, args.seeds, args.iterations, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results written to {args.output}")
+
+    if baseline is None:
+        return 0
+
+    regressions = find_regressions(baseline, results)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print(f"No regressions against {args.compare}")
+    return 1 if regressions else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
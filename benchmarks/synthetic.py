@@ -0,0 +1,120 @@
+import random
+
+from application.data_processor import DataDrivenProcessor
+from application.models import Branch, Level, Coach, CoachBranch, CoachOffday, CoachPreference, Enrollment, PopularTimeslot
+from application.time_utils import minutes_to_time
+
+# Same branches and levels as init_db.py; larger scales add numbered branches
+BRANCHES = [
+    ("Bukit Batok", "BB", 4),
+    ("Choa Chu Kang", "CCK", 4),
+    ("Changi", "CH", 5),
+    ("Hougang", "HG", 4),
+    ("Katong", "KT", 4),
+    ("Pasir Ris", "PR", 6)
+]
+
+LEVELS = [
+    ("BearyTots", "Tots", 7, 2),  # 2 slots = 1 hour
+    ("Jolly", "Jolly", 8, 2),
+    ("Bubbly", "Bubbly", 8, 2),
+    ("Lively", "Lively", 8, 2),
+    ("Flexi", "Flexi", 8, 2),
+    ("Level_1", "L1", 8, 3),
+    ("Level_2", "L2", 9, 3),
+    ("Level_3", "L3", 10, 3),
+    ("Level_4", "L4", 10, 3),
+    ("Advance", "Advance", 10, 2),
+    ("Free", "Free", 10, 2)
+]
+
+OPERATING_DAYS = ['TUE', 'WED', 'THU', 'FRI', 'SAT', 'SUN']
+RESIDENTIAL_AREAS = ['North', 'South', 'East', 'West', 'Central']
+
+# (branches, coaches) per named scale; 'small' is the size of today's data
+SCALES = {
+    'small': (6, 40),
+    'medium': (12, 150),
+    'large': (25, 400),
+    'xlarge': (50, 1000)
+}
+
+class SyntheticDataProcessor(DataDrivenProcessor):
+    """Data processor fed with generated model instances instead of database queries"""
+
+    def __init__(self, records):
+        super().__init__()
+        self.records = records
+
+    def _load_all_from_db(self):
+        self._load_from_records(**self.records)
+
+def generate_records(num_branches=6, num_coaches=40, seed=0, max_students=30, popular_slots_per_day=3):
+    """
+    Unsaved model instances for a random but reproducible dataset
+
+    Coaches get one or two branches, three to seven levels and two half-day offdays,
+    like the real data. Each level has a few popular timeslots per operating day.
+    """
+    rnd = random.Random(seed)
+
+    branches = [Branch(id=i, name=name, abbrv=abbrv, max_classes=max_classes)
+                for i, (name, abbrv, max_classes) in enumerate(BRANCHES[:num_branches], start=1)]
+    for i in range(len(branches) + 1, num_branches + 1):
+        branches.append(Branch(id=i, name=f"Branch {i}", abbrv=f"B{i:02d}", max_classes=rnd.randint(4, 6)))
+
+    levels = [Level(id=i, name=name, alias=alias, max_students=capacity, duration=duration)
+              for i, (name, alias, capacity, duration) in enumerate(LEVELS, start=1)]
+
+    enrollments = [Enrollment(branch=branch.abbrv, level_category_base=level.alias, count=rnd.randint(0, max_students))
+                   for branch in branches for level in levels]
+
+    coaches = []
+    offdays = []
+    for coach_id in range(1, num_coaches + 1):
+        status = rnd.choice(['Full time', 'Full time', 'Part time'])
+        if coach_id % 10 == 0:
+            position = 'Branch Manager'
+        else:
+            position = 'Coach' if status == 'Full time' else 'Part time'
+
+        coach = Coach(id=coach_id, name=f"Coach {coach_id}", residential_area=rnd.choice(RESIDENTIAL_AREAS),
+                      position=position, status=status)
+        coach.assigned_branches = [CoachBranch(coach_id=coach_id, branch_id=branch.id)
+                                   for branch in _by_id(rnd.sample(branches, min(len(branches), rnd.randint(1, 2))))]
+        coach.preferred_levels = [CoachPreference(coach_id=coach_id, level_id=level.id)
+                                  for level in _by_id(rnd.sample(levels, rnd.randint(3, 7)))]
+        coaches.append(coach)
+
+        for day in rnd.sample(range(1, 7), 2):
+            offdays.append(CoachOffday(coach_id=coach_id, day=day, am=rnd.random() < 0.5, reason='Synthetic'))
+
+    popular_slots = []
+    for _, alias, _, duration in LEVELS:
+        for day in OPERATING_DAYS:
+            for _ in range(popular_slots_per_day):
+                hour = rnd.choice([9, 10, 11, 14, 15, 16, 17])
+                popular_slots.append(PopularTimeslot(time_slot=f"{hour:02d}:00-{hour + 2:02d}:00", day=day, level=alias))
+
+            # One slot exactly as long as a class
+            start = 15 * 60
+            popular_slots.append(PopularTimeslot(time_slot=f"{minutes_to_time(start)}-{minutes_to_time(start + duration * 30)}",
+                                                 day=day, level=alias))
+
+    return {
+        'enrollments': enrollments,
+        'levels': levels,
+        'branches': branches,
+        'coaches': coaches,
+        'offdays': offdays,
+        'popular_slots': popular_slots
+    }
+
+def generate_data(num_branches=6, num_coaches=40, seed=0, **options):
+    """Scheduler input in the same shape load_database_driven() returns, without a database"""
+    records = generate_records(num_branches, num_coaches, seed, **options)
+    return SyntheticDataProcessor(records).load_and_process_data()
+
+def _by_id(records):
+    # Associations come back from the database in key order
+    return sorted(records, key=lambda record: record.id)
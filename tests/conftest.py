@@ -0,0 +1,17 @@
+import pytest
+
+from application import create_app, db
+
+@pytest.fixture
+def app(tmp_path):
+    """Application on a fresh in-memory SQLite database, with an app context pushed"""
+    config = tmp_path / 'test.cfg'
+    config.write_text('SECRET_KEY = "test"\n'
+                      'SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"\n'
+                      'SQLALCHEMY_TRACK_MODIFICATIONS = False\n'
+                      'WTF_CSRF_ENABLED = False\n')
+
+    app = create_app(str(config))
+    with app.app_context():
+        yield app
+        db.session.remove()
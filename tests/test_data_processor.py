@@ -0,0 +1,46 @@
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from application import db
+from application.data_processor import DataDrivenProcessor
+from benchmarks.synthetic import generate_records
+
+@contextmanager
+def count_statements():
+    """Count the SQL statements executed inside the block"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', record)
+
+def seed(num_coaches):
+    records = generate_records(num_branches=6, num_coaches=num_coaches, seed=0)
+    for key in ('branches', 'levels', 'coaches', 'offdays', 'enrollments', 'popular_slots'):
+        db.session.add_all(records[key])
+    db.session.commit()
+    db.session.expunge_all()
+
+def load_statement_count():
+    with count_statements() as statements:
+        data = DataDrivenProcessor().load_and_process_data()
+    return len(statements), data
+
+def test_loader_runs_a_fixed_number_of_queries(app):
+    seed(10)
+    few_statements, few_data = load_statement_count()
+
+    db.drop_all()
+    db.create_all()
+    seed(80)
+    many_statements, many_data = load_statement_count()
+
+    assert len(few_data['coaches_data']) == 10
+    assert len(many_data['coaches_data']) == 80
+    assert few_statements == many_statements
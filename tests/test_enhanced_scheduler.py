@@ -0,0 +1,76 @@
+import pytest
+
+from application.enhanced_scheduler import EnhancedStrictConstraintScheduler
+from application.jobs import WorkerPool
+from benchmarks.synthetic import generate_data
+
+def schedule(config):
+    scheduler = EnhancedStrictConstraintScheduler(generate_data(num_branches=3, num_coaches=12, seed=0),
+                                                  dict(config, max_iterations=1, random_seed=0))
+    return scheduler, scheduler.schedule_with_complete_coverage()
+
+def test_zero_lns_moves_disables_lns():
+    scheduler, results = schedule({'lns_max_moves': 0})
+
+    assert results['schedule']
+    assert 'lns' not in results['statistics']
+
+def test_null_lns_settings_fall_back_to_defaults():
+    scheduler, results = schedule({'lns_max_moves': None, 'lns_time_budget': None})
+
+    assert scheduler.LNS_MAX_MOVES == EnhancedStrictConstraintScheduler.LNS_MAX_MOVES
+    assert scheduler.LNS_TIME_BUDGET == EnhancedStrictConstraintScheduler.LNS_TIME_BUDGET
+    assert results['schedule']
+    assert results['statistics']['lns']['moves'] <= scheduler.LNS_MAX_MOVES
+
+def test_numeric_settings_are_coerced_to_numbers():
+    config = EnhancedStrictConstraintScheduler.coerce_config({'lns_max_moves': '5', 'lns_time_budget': '0.5',
+                                                              'patience': '2', 'time_limit_seconds': '5'})
+
+    assert config == {'lns_max_moves': 5, 'lns_time_budget': 0.5, 'patience': 2, 'time_limit_seconds': 5.0}
+    assert isinstance(config['patience'], int)
+
+@pytest.mark.parametrize('config', [{'lns_max_moves': 'abc'}, {'lns_max_moves': 2.5},
+                                    {'lns_max_moves': True}, {'lns_time_budget': 'fast'},
+                                    {'patience': 'soon'}, {'patience': 1.5}, {'patience': -1},
+                                    {'time_limit_seconds': '5s'}, {'time_limit_seconds': -0.5},
+                                    {'parallel_workers': 0}, {'parallel_workers': 'many'}])
+def test_invalid_numeric_settings_are_rejected(config):
+    with pytest.raises(ValueError):
+        EnhancedStrictConstraintScheduler.coerce_config(config)
+
+@pytest.mark.parametrize('config', [{'lns_max_moves': 'abc'}, {'patience': 'soon'}, {'time_limit_seconds': -1},
+                                    {'parallel_workers': 0}])
+def test_generate_rejects_invalid_numeric_settings(app, config):
+    response = app.test_client().post('/api/timetable/generate/', json=config)
+
+    assert response.status_code == 400
+    assert next(iter(config)) in response.get_json()['message']
+
+def test_parallel_workers_are_capped(monkeypatch):
+    monkeypatch.setattr(EnhancedStrictConstraintScheduler, '_MAX_PARALLEL_WORKERS', 2)
+    data = generate_data(num_branches=3, num_coaches=12, seed=0)
+
+    assert EnhancedStrictConstraintScheduler(data, {'parallel_workers': 64}).PARALLEL_WORKERS == 2
+    assert EnhancedStrictConstraintScheduler(data, {'parallel_workers': None}).PARALLEL_WORKERS == 1
+
+@pytest.fixture
+def worker_pool():
+    pool = WorkerPool(2)
+    yield pool
+    pool.shutdown()
+
+def test_parallel_runs_match_a_serial_run(monkeypatch, worker_pool):
+    monkeypatch.setattr(EnhancedStrictConstraintScheduler, '_MAX_PARALLEL_WORKERS', 2)
+    # Tight enough that iterations differ, so the result depends on their order and shuffles
+    data = generate_data(num_branches=3, num_coaches=10, seed=0, max_students=60)
+    config = {'max_iterations': 6, 'shuffle_interval': 2, 'random_seed': 3, 'lns_max_moves': 3, 'lns_time_budget': 0}
+
+    serial = EnhancedStrictConstraintScheduler(data, config).schedule_with_complete_coverage()
+    # The second run reuses the pool's workers
+    for _ in range(2):
+        parallel = EnhancedStrictConstraintScheduler(data, dict(config, parallel_workers=2),
+                                                     worker_pool=worker_pool).schedule_with_complete_coverage()
+
+        assert parallel['schedule'] == serial['schedule']
+        assert parallel['statistics']['search']['iterations_run'] == serial['statistics']['search']['iterations_run']
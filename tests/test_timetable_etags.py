@@ -0,0 +1,57 @@
+from datetime import datetime, time
+
+import pytest
+
+from application import db
+from application.data_processor import bump_data_version
+from application.models import Coach, Timetable, TimetableEntry
+from benchmarks.synthetic import generate_records
+
+@pytest.fixture
+def client(app):
+    records = generate_records(num_branches=2, num_coaches=2, seed=0)
+    for key in ('branches', 'levels', 'coaches'):
+        db.session.add_all(records[key])
+    db.session.flush()
+
+    branch, level, coach = records['branches'][0], records['levels'][0], records['coaches'][0]
+    for id in (1, 2):
+        db.session.add(Timetable(id=id, active=id == 1, date_created=datetime(2024, 1, id)))
+        db.session.add(TimetableEntry(timetable_id=id, branch_id=branch.id, coach_id=coach.id, level_id=level.id,
+                                      start_time=time(9), day=5))
+    db.session.commit()
+    return app.test_client()
+
+@pytest.mark.parametrize('url', ['/api/timetable/1', '/api/timetable/active'])
+def test_unchanged_timetable_is_not_modified(client, url):
+    etag = client.get(url).headers['ETag']
+
+    response = client.get(url, headers={'If-None-Match': etag})
+
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert not response.data
+
+def test_activation_changes_the_tag(client):
+    etag = client.get('/api/timetable/2').headers['ETag']
+
+    client.post('/api/timetable/2/activate')
+    response = client.get('/api/timetable/2', headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+@pytest.mark.parametrize('url', ['/api/timetable/1', '/api/timetable/active'])
+def test_data_writes_change_the_tag(client, url):
+    etag = client.get(url).headers['ETag']
+
+    # A renamed coach appears in the formatted entries
+    coach = db.session.query(Coach).first()
+    coach.name = 'Renamed Coach'
+    bump_data_version()
+    db.session.commit()
+    response = client.get(url, headers={'If-None-Match': etag})
+
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert 'Renamed Coach' in response.get_data(as_text=True)
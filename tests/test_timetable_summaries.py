@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from application import db
+from application.models import Timetable
+
+@pytest.fixture
+def client(app):
+    # Timetable 1 is the oldest and active, so it only leads the first page through show_active
+    start = datetime(2024, 1, 1)
+    db.session.add_all(Timetable(id=i, active=i == 1, date_created=start + timedelta(days=i)) for i in range(1, 6))
+    db.session.commit()
+    return app.test_client()
+
+def summary_ids(response):
+    return [timetable['id'] for timetable in response.get_json()['results']]
+
+@pytest.mark.parametrize('results', ['abc', '0', '-3', '2.5'])
+def test_invalid_results_per_page_is_rejected(client, results):
+    response = client.get('/api/timetable/', query_string={'view': 'summary', 'results': results})
+
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+def test_invalid_cursor_is_rejected(client):
+    response = client.get('/api/timetable/', query_string={'view': 'summary', 'after': 'yesterday'})
+
+    assert response.status_code == 400
+
+def test_large_results_per_page_is_capped(client):
+    response = client.get('/api/timetable/', query_string={'view': 'summary', 'results': '5000'})
+
+    assert response.status_code == 200
+    assert summary_ids(response) == [5, 4, 3, 2, 1]
+
+def test_active_timetable_only_leads_the_first_page(client):
+    first = client.get('/api/timetable/', query_string={'view': 'summary', 'results': 2, 'show_active': 1})
+    assert summary_ids(first) == [1, 5, 4]
+
+    cursor = first.get_json()['next_cursor']
+    second = client.get('/api/timetable/', query_string={'view': 'summary', 'results': 2, 'show_active': 1,
+                                                         'after': cursor})
+    assert summary_ids(second) == [3, 2]